@@ -1,9 +1,11 @@
+from typing import TYPE_CHECKING
+
 from .errors import AiohuesyncboxException as AiohuesyncboxException
 from .errors import RequestError as RequestError
 from .errors import Unauthorized as Unauthorized
 from .errors import InvalidState as InvalidState
+from .errors import InvalidResponse as InvalidResponse
 
-from .huesyncbox import HueSyncBox as HueSyncBox
 from .hue import Group as Group
 from .hue import Hue as Hue
 from .behavior import Behavior as Behavior
@@ -14,12 +16,70 @@ from .execution import SyncMode as SyncMode
 from .hdmi import Hdmi as Hdmi
 from .hdmi import Input as Input
 from .hdmi import Output as Output
+from .history import StateHistory as StateHistory
+from .health import BoxHealth as BoxHealth
+
+if TYPE_CHECKING:
+    from .huesyncbox import HueSyncBox as HueSyncBox
+    from .fleet import RegistrationReport as RegistrationReport
+    from .fleet import validate_registrations as validate_registrations
+    from .fleet import BoxConfig as BoxConfig
+    from .fleet import FleetRunner as FleetRunner
+    from .fleet import StateUpdate as StateUpdate
+    from .preset import Preset as Preset
+    from .sync import HueSyncBoxSync as HueSyncBoxSync
+    from .ratelimit import RateLimiter as RateLimiter
+    from .ratelimit import priority as priority
+    from .transport import Transport as Transport
+    from .transport import RecordingTransport as RecordingTransport
+    from .transport import ReplayTransport as ReplayTransport
+    from .rules import Rule as Rule
+    from .rules import RulesEngine as RulesEngine
+    from .metrics import MetricsExporter as MetricsExporter
+
+# These pull in aiohttp, ssl and asyncio, only import them when used
+# so importing the errors or models stays cheap.
+_LAZY_IMPORTS = {
+    "HueSyncBox": ".huesyncbox",
+    "RegistrationReport": ".fleet",
+    "validate_registrations": ".fleet",
+    "BoxConfig": ".fleet",
+    "FleetRunner": ".fleet",
+    "StateUpdate": ".fleet",
+    "Preset": ".preset",
+    "HueSyncBoxSync": ".sync",
+    "RateLimiter": ".ratelimit",
+    "priority": ".ratelimit",
+    "Transport": ".transport",
+    "RecordingTransport": ".transport",
+    "ReplayTransport": ".transport",
+    "Rule": ".rules",
+    "RulesEngine": ".rules",
+    "MetricsExporter": ".metrics",
+}
+
+
+def __getattr__(name: str):
+    if name in _LAZY_IMPORTS:
+        import importlib
+
+        module = importlib.import_module(_LAZY_IMPORTS[name], __name__)
+        value = getattr(module, name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_IMPORTS))
+
 
 __all__ = [
     "AiohuesyncboxException",
     "RequestError",
     "Unauthorized",
     "InvalidState",
+    "InvalidResponse",
     "HueSyncBox",
     "Group",
     "Hue",
@@ -31,4 +91,21 @@ __all__ = [
     "Hdmi",
     "Input",
     "Output",
+    "StateHistory",
+    "BoxHealth",
+    "RegistrationReport",
+    "validate_registrations",
+    "BoxConfig",
+    "FleetRunner",
+    "StateUpdate",
+    "Preset",
+    "HueSyncBoxSync",
+    "RateLimiter",
+    "priority",
+    "Transport",
+    "RecordingTransport",
+    "ReplayTransport",
+    "Rule",
+    "RulesEngine",
+    "MetricsExporter",
 ]
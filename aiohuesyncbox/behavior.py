@@ -1,5 +1,5 @@
 from typing import Dict
-from .helpers import generate_attribute_string
+from .helpers import generate_attribute_string, optional
 
 
 class Behavior:
@@ -8,6 +8,10 @@ class Behavior:
     def __init__(self, raw, request) -> None:
         self._raw = raw
         self._request = request
+        self._parse()
+
+    def _parse(self) -> None:
+        self._force_dovi_native = optional(self._raw, "forceDoviNative", int)
 
     async def _put(self, data: Dict) -> None:
         await self._request("put", "/behavior", data=data)
@@ -26,7 +30,7 @@ class Behavior:
     @property
     def force_dovi_native(self) -> int | None:
         """When the TV advertises Dolby Vision force to use native native mode. Disabled 0, Enabled 1."""
-        return self._raw.get("forceDoviNative")
+        return self._force_dovi_native
 
     async def set_force_dovi_native(self, enabled: int) -> None:
         """Force DolbyVision compatibility of huesyncbox on or off."""
@@ -37,3 +41,4 @@ class Behavior:
         response = await self._request("get", "/behavior")
         if response:
             self._raw = response
+            self._parse()
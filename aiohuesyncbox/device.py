@@ -1,23 +1,27 @@
-from .helpers import generate_attribute_string
+from .helpers import generate_attribute_string, optional, required
 
 
 class Wifi:
     """Represent wifi status"""
 
+    __slots__ = ("_raw", "_ssid", "_strength")
+
     def __init__(self, raw) -> None:
         self._raw = raw
+        self._ssid = required(raw, "ssid", str)
+        self._strength = required(raw, "strength", int)
 
     @property
     def ssid(self) -> str:
         """Wifi SSID"""
-        return self._raw["ssid"]
+        return self._ssid
 
     @property
     def strength(self) -> int:
         """
         0 = not connected; 1 = weak; 2 = fair; 3 = good; 4 = excellent
         """
-        return self._raw["strength"]
+        return self._strength
 
 
 class Device:
@@ -26,7 +30,7 @@ class Device:
     def __init__(self, raw, request) -> None:
         self._raw = raw
         self._request = request
-        self._wifi: Wifi | None = Wifi(self._raw["wifi"])
+        self._parse()
 
     def __str__(self) -> str:
         attributes = [
@@ -45,35 +49,47 @@ class Device:
             return NotImplemented
         return self._raw == other._raw
 
+    def _parse(self) -> None:
+        raw = self._raw
+        self._name = required(raw, "name", str)
+        self._device_type = required(raw, "deviceType", str)
+        self._unique_id = required(raw, "uniqueId", str)
+        self._ip_address = required(raw, "ipAddress", str)
+        self._api_level = required(raw, "apiLevel", int)
+        self._firmware_version = required(raw, "firmwareVersion", str)
+        self._led_mode = required(raw, "ledMode", int)
+        wifi = optional(raw, "wifi", dict)
+        self._wifi: Wifi | None = Wifi(wifi) if wifi is not None else None
+
     @property
     def name(self) -> str:
         """Friendly name of the device."""
-        return self._raw["name"]
+        return self._name
 
     @property
     def device_type(self) -> str:
         """Device Type identifier."""
-        return self._raw["deviceType"]
+        return self._device_type
 
     @property
     def unique_id(self) -> str:
         """Capitalized hex string of the 6 byte / 12 characters device id without delimiters. Used as unique id on label, certificate common name, hostname etc."""
-        return self._raw["uniqueId"]
+        return self._unique_id
 
     @property
     def ip_address(self) -> str:
         """Local IP address of the device."""
-        return self._raw["ipAddress"]
+        return self._ip_address
 
     @property
     def api_level(self) -> int:
         """Supported API level of the device."""
-        return self._raw["apiLevel"]
+        return self._api_level
 
     @property
     def firmware_version(self) -> str:
         """User readable version of the device firmware, starting with decimal major .minor .maintenance format e.g. 1.12.3."""
-        return self._raw["firmwareVersion"]
+        return self._firmware_version
 
     @property
     def wifi(self) -> Wifi | None:
@@ -85,7 +101,7 @@ class Device:
         """
         0 = off in powersave, passthrough or sync mode; 1 = regular; 2 = dimmed in powersave or passthrough mode and off in sync mode
         """
-        return self._raw["ledMode"]
+        return self._led_mode
 
     async def set_led_mode(self, mode: int) -> None:
         await self._request("put", "/device", data={"ledMode": mode})
@@ -94,4 +110,4 @@ class Device:
         response = await self._request("get", "/device")
         if response:
             self._raw = response
-            self._wifi = Wifi(self._raw["wifi"]) if "wifi" in self._raw else None
+            self._parse()
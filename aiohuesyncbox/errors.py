@@ -24,6 +24,10 @@ class InvalidState(AiohuesyncboxException):
     """Raised when the box is not in the correct state to handle the request."""
 
 
+class InvalidResponse(AiohuesyncboxException):
+    """Response of the box does not have the expected format."""
+
+
 ERRORS = {
     1: Unauthorized,
     2: Unauthorized,
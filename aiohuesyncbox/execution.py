@@ -1,17 +1,36 @@
+import contextvars
+import time
 from typing import Dict, Optional
-from .helpers import generate_attribute_string
+from .helpers import generate_attribute_string, optional, required
+
+# Set while a transition sends its steps, those do not cancel the transition
+_transition_step = contextvars.ContextVar(
+    "aiohuesyncbox_transition_step", default=False
+)
 
 
 class SyncMode:
     """Sync mode. Only intensity for now so one class is enough"""
 
+    __slots__ = ("_raw", "_intensity")
+
     def __init__(self, raw) -> None:
         self._raw = raw
+        self._intensity = required(raw, "intensity", str)
 
     @property
     def intensity(self) -> str:
         """Intensity of the mode (subtle, moderate, high, intense)."""
-        return self._raw["intensity"]
+        return self._intensity
+
+
+class _Transition:
+    """Running brightness transition, shared by the Execution objects of a box."""
+
+    __slots__ = ("current",)
+
+    def __init__(self) -> None:
+        self.current: Optional[object] = None
 
 
 class Execution:
@@ -20,7 +39,8 @@ class Execution:
     def __init__(self, raw, request) -> None:
         self._raw = raw
         self._request = request
-        self._update_syncmodes()
+        self._transition = _Transition()
+        self._parse()
 
     def __str__(self):
         attributes = [
@@ -42,12 +62,27 @@ class Execution:
             return NotImplemented
         return self._raw == other._raw
 
-    def _update_syncmodes(self) -> None:
-        self._syncmode_video = SyncMode(self._raw["video"])
-        self._syncmode_game = SyncMode(self._raw["game"])
-        self._syncmode_music = SyncMode(self._raw["music"])
+    def _parse(self) -> None:
+        raw = self._raw
+        self._sync_active = required(raw, "syncActive", bool)
+        self._hdmi_active = required(raw, "hdmiActive", bool)
+        # Modes are kept as strings so new modes do not break parsing
+        self._mode = required(raw, "mode", str)
+        self._last_sync_mode = optional(raw, "lastSyncMode", str)
+        self._hdmi_source = required(raw, "hdmiSource", str)
+        self._hue_target = optional(raw, "hueTarget", str)
+        self._brightness = required(raw, "brightness", int)
+        self._syncmode_video = SyncMode(required(raw, "video", dict))
+        self._syncmode_game = SyncMode(required(raw, "game", dict))
+        self._syncmode_music = SyncMode(required(raw, "music", dict))
+
+    def _cancel_transition(self) -> None:
+        if not _transition_step.get():
+            self._transition.current = None
 
     async def _put(self, data: Dict) -> None:
+        # Any other command cancels a running transition
+        self._cancel_transition()
         await self._request("put", "/execution", data=data)
 
     @property
@@ -56,14 +91,14 @@ class Execution:
             Reports false in case of powersave or passthrough mode,
         and true in case of video, game, or music mode.
         """
-        return self._raw["syncActive"]
+        return self._sync_active
 
     @property
     def hdmi_active(self) -> bool:
         """Reports false in case of powersave mode,
         and true in case of passthrough, video, game or music mode.
         """
-        return self._raw["hdmiActive"]
+        return self._hdmi_active
 
     @property
     def mode(self) -> str:
@@ -71,22 +106,22 @@ class Execution:
         powersave, passthrough, video, game, music, ambient (ambient is deprecated and will be removed in the future)
         (More modes can be added in the future, so clients must gracefully handle modes they don’t recognize)
         """
-        return self._raw["mode"]
+        return self._mode
 
     @property
-    def last_sync_mode(self) -> str:
+    def last_sync_mode(self) -> Optional[str]:
         """Last sync mode used."""
-        return self._raw["lastSyncMode"]
+        return self._last_sync_mode
 
     @property
     def hdmi_source(self) -> str:
         """Current selected HDMI source input1, input2, input3, input4."""
-        return self._raw["hdmiSource"]
+        return self._hdmi_source
 
     @property
-    def hue_target(self) -> str:
+    def hue_target(self) -> Optional[str]:
         """Currently selected entertainment area. Corresponds to a group under /hue. E.g. "groups/13" """
-        return self._raw["hueTarget"]
+        return self._hue_target
 
     @property
     def brightness(self) -> int:
@@ -94,7 +129,7 @@ class Execution:
         Brightness of the huesyncbox.
         0 – 200 (100 = no brightness reduction/boost compared to input, 0 = max reduction, 200 = max boost)
         """
-        return self._raw["brightness"]
+        return self._brightness
 
     @property
     def video(self) -> SyncMode:
@@ -190,8 +225,67 @@ class Execution:
         }
         await self._put(data)
 
+    async def transition_brightness(
+        self, target: int, duration: float, min_interval: float = 0.05
+    ) -> bool:
+        """
+        Change brightness gradually to target over duration seconds.
+
+        Only one step is sent at a time and each step uses the brightness for the moment it is sent,
+        so steps are skipped instead of queued when the box responds slowly.
+        Between steps at least the measured round trip time is waited to not overload the box.
+        Other changes of execution cancel the transition, also when made with
+        `HueSyncBox.request()`, a Preset or a FleetRunner.
+
+        Returns True when the target was reached and False when cancelled.
+        """
+        # Imported here to keep importing the models cheap
+        import asyncio
+
+        transition = object()
+        self._transition.current = transition
+
+        start_value = self.brightness
+        start = time.monotonic()
+        round_trip: Optional[float] = None
+        last_value = start_value
+
+        while True:
+            step_start = time.monotonic()
+            fraction = (
+                min(1.0, (step_start - start) / duration) if duration > 0 else 1.0
+            )
+            value = round(start_value + (target - start_value) * fraction)
+
+            if value != last_value:
+                step = _transition_step.set(True)
+                try:
+                    await self._request("put", "/execution", data={"brightness": value})
+                finally:
+                    _transition_step.reset(step)
+                if self._transition.current is not transition:
+                    return False
+                last_value = value
+                measured = time.monotonic() - step_start
+                round_trip = (
+                    measured
+                    if round_trip is None
+                    else 0.7 * round_trip + 0.3 * measured
+                )
+
+            if fraction >= 1.0:
+                break
+
+            interval = max(min_interval, round_trip or 0.0)
+            await asyncio.sleep(max(0.0, step_start + interval - time.monotonic()))
+            if self._transition.current is not transition:
+                return False
+
+        self._transition.current = None
+        return True
+
     async def update(self) -> None:
         response = await self._request("get", "/execution")
         if response:
             self._raw = response
-            self._update_syncmodes()
+            self._parse()
@@ -0,0 +1,468 @@
+"""Helpers to work with multiple huesyncboxes at once."""
+
+import asyncio
+import itertools
+import logging
+import multiprocessing
+import os
+import time
+from dataclasses import dataclass, field
+from queue import Empty
+from typing import (
+    Any,
+    AsyncIterator,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+)
+
+from .errors import (
+    AiohuesyncboxException,
+    InvalidResponse,
+    InvalidState,
+    RequestError,
+    Unauthorized,
+)
+from .helpers import resolve_path
+from .history import DEFAULT_FIELDS
+from .huesyncbox import HueSyncBox
+from .transport import Transport
+
+DEFAULT_MAX_PARALLEL = 10
+DEFAULT_POLL_INTERVAL = 5.0
+# Seconds to wait for workers to stop before terminating them
+STOP_TIMEOUT = 5.0
+# Seconds between checks whether the worker processes are still alive
+_LIVENESS_INTERVAL = 1.0
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class RegistrationReport:
+    """Result of validating the tokens of a fleet of huesyncboxes."""
+
+    valid: List[HueSyncBox] = field(default_factory=list)
+    """Boxes that accepted the access token."""
+
+    invalid: List[HueSyncBox] = field(default_factory=list)
+    """Boxes that rejected the access token."""
+
+    unreachable: List[HueSyncBox] = field(default_factory=list)
+    """Boxes that could not be reached or returned an unexpected error."""
+
+
+async def validate_registrations(
+    boxes: Iterable[HueSyncBox], max_parallel: int = DEFAULT_MAX_PARALLEL
+) -> RegistrationReport:
+    """
+    Check the access tokens of multiple huesyncboxes concurrently.
+
+    At most `max_parallel` boxes are checked at the same time.
+    The connections opened for the check stay with the HueSyncBox instances,
+    so a following `initialize()` on the valid boxes reuses them.
+    """
+    if max_parallel < 1:
+        raise ValueError("max_parallel must be at least 1")
+
+    semaphore = asyncio.Semaphore(max_parallel)
+
+    async def _validate(box: HueSyncBox) -> Optional[bool]:
+        async with semaphore:
+            try:
+                return await box.is_registered()
+            except AiohuesyncboxException as err:
+                logger.debug("Validating registration failed, %s", err)
+                return None
+            except Exception:
+                # One misbehaving box must not prevent the report for the others
+                logger.exception("Validating registration of %s failed", box.host)
+                return None
+
+    boxes = list(boxes)
+    results = await asyncio.gather(*(_validate(box) for box in boxes))
+
+    report = RegistrationReport()
+    for box, registered in zip(boxes, results):
+        if registered is None:
+            report.unreachable.append(box)
+        elif registered:
+            report.valid.append(box)
+        else:
+            report.invalid.append(box)
+    return report
+
+
+@dataclass(frozen=True)
+class BoxConfig:
+    """Connection info of a box managed by a FleetRunner."""
+
+    host: str
+    id: str
+    access_token: Optional[str] = None
+    port: int = 443
+    path: str = "/api"
+    keep_alive: Optional[float] = None
+    transport: Optional[Callable[[], Transport]] = None
+    """
+    Creates the Transport of the box in the worker process, e.g. to replay recorded traffic.
+    It is sent to the worker, so it must be picklable like a class or `functools.partial`.
+    """
+
+
+@dataclass(frozen=True)
+class StateUpdate:
+    """Changed fields of a box, or an error when the box could not be updated."""
+
+    box_id: str
+    timestamp: float
+    changes: Dict[str, Any]
+    error: Optional[str] = None
+
+
+# Messages between the coordinator and the workers are plain tuples to keep them small
+# Worker -> coordinator
+_STATE = 0  # (_STATE, box_id, timestamp, changes)
+_ERROR = 1  # (_ERROR, box_id, timestamp, message)
+_RESULT = 2  # (_RESULT, request_id, error, response), error is (class name, message)
+_STOPPED = 3  # (_STOPPED, worker_index, error), error is None when stopped on request
+# Coordinator -> worker, None stops the worker
+# (request_id, box_id, method, path, data)
+
+# Errors of requests are raised with the same class in the coordinator
+_ERROR_CLASSES = {
+    cls.__name__: cls
+    for cls in (
+        AiohuesyncboxException,
+        RequestError,
+        Unauthorized,
+        InvalidState,
+        InvalidResponse,
+    )
+}
+
+
+def _error_from_worker(name: str, message: str) -> AiohuesyncboxException:
+    cls = _ERROR_CLASSES.get(name)
+    if cls is None:
+        return AiohuesyncboxException(f"{name}: {message}")
+    return cls(message)
+
+
+async def _poll_box(
+    box_id: str, box: HueSyncBox, interval: float, fields: Sequence[str], updates: Any
+) -> None:
+    last: Dict[str, Any] = {}
+    while True:
+        start = time.monotonic()
+        try:
+            await box.update()
+            values = {path: resolve_path(box, path) for path in fields}
+        except AiohuesyncboxException as err:
+            updates.put((_ERROR, box_id, time.time(), str(err)))
+        except Exception as err:
+            # Keep polling, one bad response must not stop the box for good
+            logger.exception("Polling box %s failed", box_id)
+            updates.put((_ERROR, box_id, time.time(), f"{type(err).__name__}: {err}"))
+        else:
+            changes = {
+                path: value
+                for path, value in values.items()
+                if path not in last or last[path] != value
+            }
+            last = values
+            if changes:
+                updates.put((_STATE, box_id, time.time(), changes))
+        # Poll unhealthy boxes less often so they do not slow down the others
+        poll_interval = box.health.poll_interval(interval)
+        await asyncio.sleep(max(0.0, poll_interval - (time.monotonic() - start)))
+
+
+async def _handle_command(boxes: Dict[str, HueSyncBox], command: Tuple, updates: Any):
+    request_id, box_id, method, path, data = command
+    try:
+        response = await boxes[box_id].request(method, path, data, priority=True)
+    except Exception as err:
+        if not isinstance(err, AiohuesyncboxException):
+            logger.exception("Request %s %s to box %s failed", method, path, box_id)
+        updates.put((_RESULT, request_id, (type(err).__name__, str(err)), None))
+    else:
+        updates.put((_RESULT, request_id, None, response))
+
+
+async def _worker_main(
+    configs: List[BoxConfig],
+    interval: float,
+    fields: Sequence[str],
+    commands: Any,
+    updates: Any,
+) -> None:
+    transports = {
+        config.id: config.transport()
+        for config in configs
+        if config.transport is not None
+    }
+    boxes = {
+        config.id: HueSyncBox(
+            config.host,
+            config.id,
+            access_token=config.access_token,
+            port=config.port,
+            path=config.path,
+            keep_alive=config.keep_alive,
+            transport=transports.get(config.id),
+        )
+        for config in configs
+    }
+    for box in boxes.values():
+        # There is no async with block in the worker, start it here
+        box._start_keep_alive()
+    loop = asyncio.get_running_loop()
+    tasks = [
+        asyncio.create_task(_poll_box(box_id, box, interval, fields, updates))
+        for box_id, box in boxes.items()
+    ]
+    try:
+        while True:
+            command = await loop.run_in_executor(None, commands.get)
+            if command is None:
+                break
+            tasks.append(asyncio.create_task(_handle_command(boxes, command, updates)))
+            tasks = [task for task in tasks if not task.done()]
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        await asyncio.gather(*(box.close() for box in boxes.values()))
+        for transport in transports.values():
+            transport.close()
+
+
+def _worker(
+    index: int,
+    configs: List[BoxConfig],
+    interval: float,
+    fields: Sequence[str],
+    commands: Any,
+    updates: Any,
+) -> None:
+    error = None
+    try:
+        asyncio.run(_worker_main(configs, interval, fields, commands, updates))
+    except Exception as err:
+        logger.exception("Worker %s failed", index)
+        error = f"{type(err).__name__}: {err}"
+    finally:
+        updates.put((_STOPPED, index, error))
+
+
+class FleetRunner:
+    """
+    Poll and control many huesyncboxes using multiple processes.
+
+    Boxes are divided over worker processes that each run their own event loop and connections,
+    so TLS and JSON handling is spread over CPU cores. Workers only send the fields
+    that changed since the previous update of a box.
+
+        async with FleetRunner(configs, workers=4) as runner:
+            async for update in runner.updates():
+                ...
+    """
+
+    def __init__(
+        self,
+        boxes: Sequence[BoxConfig],
+        workers: Optional[int] = None,
+        poll_interval: float = DEFAULT_POLL_INTERVAL,
+        fields: Sequence[str] = DEFAULT_FIELDS,
+    ) -> None:
+        ids = [config.id for config in boxes]
+        if len(set(ids)) != len(ids):
+            raise ValueError("Box ids must be unique")
+        workers = workers or os.cpu_count() or 1
+        self._configs = list(boxes)
+        self._workers = max(1, min(workers, len(self._configs)))
+        self._poll_interval = poll_interval
+        self._fields = list(fields)
+
+        self._context = multiprocessing.get_context("spawn")
+        self._processes: List[Any] = []
+        self._commands: List[Any] = []
+        self._shard: Dict[str, int] = {}
+        self._stopped: Set[int] = set()
+        self._stopping = False
+        self._updates_queue: Any = None
+        self._reader: Optional[asyncio.Task] = None
+        self._subscribers: List[asyncio.Queue] = []
+        # Request id -> (worker index, future)
+        self._pending: Dict[int, Tuple[int, asyncio.Future]] = {}
+        self._request_ids = itertools.count()
+        self._state: Dict[str, Dict[str, Any]] = {}
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.stop()
+
+    @property
+    def state(self) -> Dict[str, Dict[str, Any]]:
+        """Last known values of the fields per box id."""
+        return self._state
+
+    async def start(self) -> None:
+        if self._processes:
+            return
+        self._stopped = set()
+        self._stopping = False
+        self._updates_queue = self._context.Queue()
+        for index in range(self._workers):
+            configs = self._configs[index :: self._workers]
+            for config in configs:
+                self._shard[config.id] = index
+            commands = self._context.Queue()
+            process = self._context.Process(
+                target=_worker,
+                args=(
+                    index,
+                    configs,
+                    self._poll_interval,
+                    self._fields,
+                    commands,
+                    self._updates_queue,
+                ),
+                daemon=True,
+            )
+            process.start()
+            self._commands.append(commands)
+            self._processes.append(process)
+        self._reader = asyncio.create_task(self._read_updates())
+
+    async def stop(self) -> None:
+        if not self._processes:
+            return
+        self._stopping = True
+        for commands in self._commands:
+            commands.put(None)
+        loop = asyncio.get_running_loop()
+        deadline = time.monotonic() + STOP_TIMEOUT
+        for process in self._processes:
+            timeout = max(0.0, deadline - time.monotonic())
+            await loop.run_in_executor(None, process.join, timeout)
+            if process.is_alive():
+                logger.warning("Worker %s did not stop, terminating it", process.pid)
+                process.terminate()
+                await loop.run_in_executor(None, process.join)
+        if self._reader is not None:
+            await self._reader
+            self._reader = None
+        self._processes = []
+        self._commands = []
+
+    def _get_message(self) -> Optional[Tuple]:
+        try:
+            return self._updates_queue.get(timeout=_LIVENESS_INTERVAL)
+        except Empty:
+            return None
+
+    async def _read_updates(self) -> None:
+        loop = asyncio.get_running_loop()
+        while len(self._stopped) < self._workers:
+            message = await loop.run_in_executor(None, self._get_message)
+            if message is None:
+                # Workers that are killed do not report that they stopped,
+                # workers that exit normally always do
+                for index, process in enumerate(self._processes):
+                    if not process.is_alive() and process.exitcode != 0:
+                        self._worker_stopped(index, f"exit code {process.exitcode}")
+                continue
+            kind = message[0]
+            if kind == _STATE:
+                _, box_id, timestamp, changes = message
+                self._state.setdefault(box_id, {}).update(changes)
+                self._publish(StateUpdate(box_id, timestamp, changes))
+            elif kind == _ERROR:
+                _, box_id, timestamp, error = message
+                self._publish(StateUpdate(box_id, timestamp, {}, error))
+            elif kind == _RESULT:
+                _, request_id, error, response = message
+                _, future = self._pending.pop(request_id, (None, None))
+                if future is not None and not future.done():
+                    if error is not None:
+                        future.set_exception(_error_from_worker(*error))
+                    else:
+                        future.set_result(response)
+            elif kind == _STOPPED:
+                _, index, error = message
+                self._worker_stopped(index, error)
+
+        for _, future in self._pending.values():
+            if not future.done():
+                future.set_exception(AiohuesyncboxException("FleetRunner stopped"))
+        self._pending.clear()
+        for queue in self._subscribers:
+            queue.put_nowait(None)
+
+    def _worker_stopped(self, index: int, error: Optional[str]) -> None:
+        if index in self._stopped:
+            return
+        self._stopped.add(index)
+        if self._stopping and error is None:
+            return
+
+        message = f"Worker process stopped, {error}"
+        logger.error("Worker %s stopped, %s", index, error)
+        for request_id, (worker, future) in list(self._pending.items()):
+            if worker == index:
+                del self._pending[request_id]
+                if not future.done():
+                    future.set_exception(AiohuesyncboxException(message))
+        timestamp = time.time()
+        for box_id, worker in self._shard.items():
+            if worker == index:
+                self._publish(StateUpdate(box_id, timestamp, {}, message))
+
+    def _publish(self, update: StateUpdate) -> None:
+        for queue in self._subscribers:
+            queue.put_nowait(update)
+
+    async def updates(self) -> AsyncIterator[StateUpdate]:
+        """Iterate over the updates of all boxes until the runner is stopped."""
+        queue: asyncio.Queue = asyncio.Queue()
+        self._subscribers.append(queue)
+        try:
+            while True:
+                update = await queue.get()
+                if update is None:
+                    return
+                yield update
+        finally:
+            self._subscribers.remove(queue)
+
+    async def request(
+        self, box_id: str, method: str, path: str, data: Optional[Dict] = None
+    ) -> Any:
+        """
+        Make a request to a box, e.g. `await runner.request(box_id, "put", "/execution", {"mode": "video"})`
+
+        Requests are handled with priority over polling. Errors of the box are raised
+        with the same class as HueSyncBox.request() would raise them.
+        """
+        if not self._processes:
+            raise AiohuesyncboxException("FleetRunner is not running")
+        if box_id not in self._shard:
+            raise ValueError(f"Unknown box id {box_id}")
+        worker = self._shard[box_id]
+        if worker in self._stopped:
+            raise AiohuesyncboxException(f"Worker process of box {box_id} stopped")
+        request_id = next(self._request_ids)
+        future = asyncio.get_running_loop().create_future()
+        self._pending[request_id] = (worker, future)
+        self._commands[worker].put((request_id, box_id, method, path, data))
+        return await future
@@ -1,36 +1,43 @@
-from typing import Dict
-from .helpers import generate_attribute_string
+from typing import Dict, Optional
+from .helpers import generate_attribute_string, optional, required
 
 INPUTS = ["input1", "input2", "input3", "input4"]
 
 
 class Input:
+    __slots__ = ("_raw", "_name", "_type", "_status", "_last_sync_mode")
+
     def __init__(self, raw: Dict) -> None:
         self._raw = raw
+        self._name = required(raw, "name", str)
+        self._type = required(raw, "type", str)
+        # Status is kept as string so new statuses do not break parsing
+        self._status = required(raw, "status", str)
+        self._last_sync_mode = optional(raw, "lastSyncMode", str)
 
     @property
     def name(self) -> str:
         """Friendly name of the input."""
-        return self._raw["name"]
+        return self._name
 
     @property
     def type(self) -> str:
         """Type of the input."""
-        return self._raw["type"]
+        return self._type
 
     @property
     def status(self) -> str:
         """Status of the input: unplugged, plugged, linked, unknown"""
-        return self._raw["status"]
+        return self._status
 
     @property
-    def last_sync_mode(self) -> str:
+    def last_sync_mode(self) -> Optional[str]:
         """Last sync mode of the input."""
-        return self._raw["lastSyncMode"]
+        return self._last_sync_mode
 
 
 class Output(Input):
-    pass
+    __slots__ = ()
 
 
 class Hdmi:
@@ -39,7 +46,7 @@ class Hdmi:
     def __init__(self, raw, request) -> None:
         self._raw = raw
         self._request = request
-        self._update_inputs_and_output()
+        self._parse()
 
     def __str__(self):
         attributes = [
@@ -56,50 +63,55 @@ class Hdmi:
             return NotImplemented
         return self._raw == other._raw
 
-    def _update_inputs_and_output(self) -> None:
-        for input_id in INPUTS:
-            if input_id in self._raw:
-                input = Input(self._raw[input_id])
-                setattr(self, f"_{input_id}", input)
-        self._output = Output(self._raw["output"])
+    def _parse(self) -> None:
+        raw = self._raw
+        self._content_specs = required(raw, "contentSpecs", str)
+        self._video_sync_supported = required(raw, "videoSyncSupported", bool)
+        self._audio_sync_supported = required(raw, "audioSyncSupported", bool)
+        inputs = [optional(raw, input_id, dict) for input_id in INPUTS]
+        self._input1, self._input2, self._input3, self._input4 = [
+            Input(input) if input is not None else None for input in inputs
+        ]
+        output = optional(raw, "output", dict)
+        self._output = Output(output) if output is not None else None
 
     @property
     def content_specs(self) -> str:
         """Content specs of current input of huesyncbox."""
-        return self._raw["contentSpecs"]
+        return self._content_specs
 
     @property
     def video_sync_supported(self) -> bool:
         """Indicates if syncing is supported on video content."""
-        return self._raw["videoSyncSupported"]
+        return self._video_sync_supported
 
     @property
     def audio_sync_supported(self) -> bool:
         """Indicates if syncing is supported on audio content."""
-        return self._raw["audioSyncSupported"]
+        return self._audio_sync_supported
 
     @property
-    def input1(self) -> Input:
+    def input1(self) -> Optional[Input]:
         """HDMI input 1 of the huesyncbox."""
-        return getattr(self, "_input1")
+        return self._input1
 
     @property
-    def input2(self) -> Input:
+    def input2(self) -> Optional[Input]:
         """HDMI input 2 of the huesyncbox."""
-        return getattr(self, "_input2")
+        return self._input2
 
     @property
-    def input3(self) -> Input:
+    def input3(self) -> Optional[Input]:
         """HDMI input 3 of the huesyncbox."""
-        return getattr(self, "_input3")
+        return self._input3
 
     @property
-    def input4(self) -> Input:
+    def input4(self) -> Optional[Input]:
         """HDMI input 4 of the huesyncbox."""
-        return getattr(self, "_input4")
+        return self._input4
 
     @property
-    def output(self) -> Output:
+    def output(self) -> Optional[Output]:
         """HDMI output of the huesyncbox."""
         return self._output
 
@@ -107,4 +119,4 @@ class Hdmi:
         response = await self._request("get", "/hdmi")
         if response:
             self._raw = response
-            self._update_inputs_and_output()
+            self._parse()
@@ -0,0 +1,95 @@
+"""Health of the connection with a huesyncbox."""
+
+from typing import Optional
+
+# Factor per wifi strength, 0 = not connected; 1 = weak; 2 = fair; 3 = good; 4 = excellent
+WIFI_FACTORS = {0: 0.5, 1: 0.6, 2: 0.9, 3: 1.0, 4: 1.0}
+# Factor per hue connection state, unknown states count as a problem
+HUE_CONNECTION_FACTORS = {
+    "connected": 1.0,
+    "streaming": 1.0,
+    "connecting": 0.8,
+    "invalidgroup": 0.8,
+}
+HUE_CONNECTION_DEFAULT_FACTOR = 0.6
+
+
+class BoxHealth:
+    """
+    Health score of a box based on recent request latency, error rate and reported wifi and bridge state.
+
+    The score is between 0 (bad) and 1 (healthy). Latency and error rate are exponential
+    moving averages, so the score follows recent behaviour.
+    Schedulers can use `poll_interval()` to poll degraded boxes less often,
+    commands should still be sent right away.
+    """
+
+    def __init__(
+        self,
+        good_latency: float = 0.5,
+        bad_latency: float = 5.0,
+        smoothing: float = 0.2,
+        degraded_threshold: float = 0.5,
+    ) -> None:
+        self._good_latency = good_latency
+        self._bad_latency = bad_latency
+        self._smoothing = smoothing
+        self._degraded_threshold = degraded_threshold
+
+        self._latency: Optional[float] = None
+        self._error_rate = 0.0
+        self._wifi_strength: Optional[int] = None
+        self._hue_connection_state: Optional[str] = None
+
+    def __str__(self) -> str:
+        return f"score: {self.score:.2f}, latency: {self.latency}, error_rate: {self._error_rate:.2f}"
+
+    def record_request(self, latency: float, error: bool) -> None:
+        alpha = self._smoothing
+        if self._latency is None:
+            self._latency = latency
+        else:
+            self._latency += alpha * (latency - self._latency)
+        self._error_rate += alpha * ((1.0 if error else 0.0) - self._error_rate)
+
+    def record_state(
+        self, wifi_strength: Optional[int], hue_connection_state: Optional[str]
+    ) -> None:
+        self._wifi_strength = wifi_strength
+        self._hue_connection_state = hue_connection_state
+
+    @property
+    def latency(self) -> Optional[float]:
+        """Average recent request latency in seconds."""
+        return self._latency
+
+    @property
+    def error_rate(self) -> float:
+        """Average recent fraction of failed requests."""
+        return self._error_rate
+
+    @property
+    def score(self) -> float:
+        score = 1.0 - self._error_rate
+
+        if self._latency is not None and self._latency > self._good_latency:
+            excess = (self._latency - self._good_latency) / (
+                self._bad_latency - self._good_latency
+            )
+            score *= max(0.0, 1.0 - excess)
+
+        if self._wifi_strength is not None:
+            score *= WIFI_FACTORS.get(self._wifi_strength, 1.0)
+        if self._hue_connection_state is not None:
+            score *= HUE_CONNECTION_FACTORS.get(
+                self._hue_connection_state, HUE_CONNECTION_DEFAULT_FACTOR
+            )
+        return score
+
+    @property
+    def degraded(self) -> bool:
+        return self.score < self._degraded_threshold
+
+    def poll_interval(self, base: float, max_factor: float = 8.0) -> float:
+        """Interval to poll the box with, grows up to `max_factor` times `base` as the score drops."""
+        return base / max(self.score, 1.0 / max_factor)
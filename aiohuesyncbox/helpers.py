@@ -1,6 +1,10 @@
 """Helper functions."""
 
-from typing import List
+from typing import Any, List, Optional, Type, TypeVar
+
+from .errors import InvalidResponse
+
+T = TypeVar("T")
 
 
 def generate_attribute_string(self, attributes: List) -> str:
@@ -8,3 +12,40 @@ def generate_attribute_string(self, attributes: List) -> str:
     for attribute in attributes:
         output += f"{attribute}: {getattr(self, attribute, None)}\n"
     return output
+
+
+def _check_type(value: Any, key: str, type_: Type[T]) -> T:
+    # bool is a subclass of int, but a bool is not a valid value for an int field
+    if not isinstance(value, type_) or (type_ is int and isinstance(value, bool)):
+        raise InvalidResponse(
+            f"Invalid value for '{key}', expected {type_.__name__} got {value!r}"
+        )
+    return value
+
+
+def required(raw: Any, key: str, type_: Type[T]) -> T:
+    """Get value of `key` from raw response data, raises InvalidResponse when missing or of the wrong type."""
+    if not isinstance(raw, dict):
+        raise InvalidResponse(f"Expected an object containing '{key}', got {raw!r}")
+    if key not in raw:
+        raise InvalidResponse(f"Missing '{key}' in response")
+    return _check_type(raw[key], key, type_)
+
+
+def optional(raw: Any, key: str, type_: Type[T]) -> Optional[T]:
+    """Get value of `key` from raw response data or None when not available, raises InvalidResponse when of the wrong type."""
+    if not isinstance(raw, dict):
+        raise InvalidResponse(f"Expected an object containing '{key}', got {raw!r}")
+    value = raw.get(key)
+    if value is None:
+        return None
+    return _check_type(value, key, type_)
+
+
+def resolve_path(obj: Any, path: str) -> Any:
+    """Get an attribute by dotted path, e.g. "execution.mode", returns None when not available."""
+    for name in path.split("."):
+        obj = getattr(obj, name, None)
+        if obj is None:
+            return None
+    return obj
@@ -0,0 +1,286 @@
+"""Fixed size history of the state of a huesyncbox."""
+
+import time
+from array import array
+from typing import Any, Dict, List, Optional, Sequence, Set, Tuple
+
+from .helpers import resolve_path
+
+MISSING = -1
+"""Stored when a field is not available."""
+
+# Known values of enum fields, unknown values get a code when first seen.
+# Codes are stable for a StateHistory instance.
+INPUT_STATUSES = ["unplugged", "plugged", "linked", "unknown"]
+ENUMS: Dict[str, List[str]] = {
+    "execution.mode": ["powersave", "passthrough", "video", "game", "music", "ambient"],
+    "execution.hdmi_source": ["input1", "input2", "input3", "input4"],
+    "hdmi.input1.status": INPUT_STATUSES,
+    "hdmi.input2.status": INPUT_STATUSES,
+    "hdmi.input3.status": INPUT_STATUSES,
+    "hdmi.input4.status": INPUT_STATUSES,
+    "hue.connection_state": [
+        "uninitialized",
+        "disconnected",
+        "connecting",
+        "unauthorized",
+        "connected",
+        "invalidgroup",
+        "streaming",
+    ],
+}
+
+DEFAULT_CAPACITY = 1024
+
+DEFAULT_FIELDS = [
+    "execution.mode",
+    "execution.brightness",
+    "execution.sync_active",
+    "execution.hdmi_source",
+    "hdmi.input1.status",
+    "hdmi.input2.status",
+    "hdmi.input3.status",
+    "hdmi.input4.status",
+    "device.wifi.strength",
+]
+
+
+class Aggregate:
+    """Time weighted aggregate of a numeric field."""
+
+    __slots__ = ("min", "max", "mean", "count")
+
+    def __init__(self, min: float, max: float, mean: float, count: int) -> None:
+        self.min = min
+        self.max = max
+        self.mean = mean
+        self.count = count
+
+    def __repr__(self) -> str:
+        return f"Aggregate(min={self.min}, max={self.max}, mean={self.mean}, count={self.count})"
+
+
+class StateHistory:
+    """
+    Ring buffer with timestamped samples of selected fields of a HueSyncBox.
+
+    Fields are dotted attribute paths on the box, e.g. "execution.brightness" or "hdmi.input3.status".
+    Integer and boolean fields are stored as is, string fields (modes, statuses) are stored as small integer codes
+    that are assigned as values appear.
+
+    The buffers are allocated up front: 8 bytes per sample for the timestamp plus 2 bytes per field per sample.
+    With the default capacity of 1024 samples and the 9 default fields that is about 27 kB per box,
+    so 2.7 MB for 100 boxes. Storing every sample of 24 hours at 1 Hz (capacity 86400) takes about 2.2 MB per box.
+
+    By default a sample is only stored when one of the fields changed. A field keeps its value
+    until the next sample, so queries and aggregates are still correct and 1024 changes
+    usually cover much more than a day. Use `record_unchanged` to store every sample.
+
+    Attach to a box with `box.add_update_listener(history.record)`.
+    """
+
+    def __init__(
+        self,
+        capacity: int = DEFAULT_CAPACITY,
+        fields: Sequence[str] = DEFAULT_FIELDS,
+        record_unchanged: bool = False,
+    ) -> None:
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        self._capacity = capacity
+        self._fields = list(fields)
+        self._record_unchanged = record_unchanged
+
+        self._timestamps = array("d", bytes(8 * capacity))
+        self._values = {
+            field: array("h", bytes(2 * capacity)) for field in self._fields
+        }
+        self._start = 0  # Index of the oldest sample
+        self._size = 0
+        self._last_time: Optional[float] = None
+        self._last_codes: Optional[Tuple[int, ...]] = None
+
+        self._codes: Dict[str, Dict[Any, int]] = {}
+        self._decode: Dict[str, List[Any]] = {}
+        self._bools: Set[str] = set()
+        for field in self._fields:
+            if field in ENUMS:
+                self._decode[field] = list(ENUMS[field])
+                self._codes[field] = {
+                    value: code for code, value in enumerate(ENUMS[field])
+                }
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def fields(self) -> List[str]:
+        return list(self._fields)
+
+    @property
+    def capacity(self) -> int:
+        return self._capacity
+
+    def _encode(self, field: str, value: Any) -> int:
+        if value is None:
+            return MISSING
+        codes = self._codes.get(field)
+        if codes is None and isinstance(value, str):
+            # String fields without known values get their codes as values appear
+            codes = self._codes[field] = {}
+            self._decode[field] = []
+        if codes is None:
+            if isinstance(value, bool):
+                self._bools.add(field)
+            return int(value)
+        code = codes.get(value)
+        if code is None:
+            code = len(self._decode[field])
+            codes[value] = code
+            self._decode[field].append(value)
+        return code
+
+    def _decode_value(self, field: str, code: int) -> Any:
+        if code == MISSING:
+            return None
+        decode = self._decode.get(field)
+        if decode is not None:
+            return decode[code]
+        return bool(code) if field in self._bools else code
+
+    def record(self, box: Any, timestamp: Optional[float] = None) -> bool:
+        """Record the current state of the box. Returns True when a sample was stored."""
+        if timestamp is None:
+            timestamp = time.time()
+        codes = tuple(
+            self._encode(field, resolve_path(box, field)) for field in self._fields
+        )
+        self._last_time = timestamp
+        if not self._record_unchanged and codes == self._last_codes:
+            return False
+        self._last_codes = codes
+
+        if self._size < self._capacity:
+            index = (self._start + self._size) % self._capacity
+            self._size += 1
+        else:
+            index = self._start
+            self._start = (self._start + 1) % self._capacity
+
+        self._timestamps[index] = timestamp
+        for field, code in zip(self._fields, codes):
+            self._values[field][index] = code
+        return True
+
+    def _index(self, position: int) -> int:
+        return (self._start + position) % self._capacity
+
+    def _bisect(self, timestamp: float) -> int:
+        """Position of the first sample at or after timestamp."""
+        low, high = 0, self._size
+        timestamps = self._timestamps
+        while low < high:
+            mid = (low + high) // 2
+            if timestamps[self._index(mid)] < timestamp:
+                low = mid + 1
+            else:
+                high = mid
+        return low
+
+    def _range(self, start: Optional[float], end: Optional[float]) -> Tuple[int, int]:
+        first = 0 if start is None else self._bisect(start)
+        last = self._size if end is None else self._bisect(end)
+        return first, last
+
+    def samples(
+        self, field: str, start: Optional[float] = None, end: Optional[float] = None
+    ) -> List[Tuple[float, Any]]:
+        """Stored samples of a field with timestamps in [start, end)."""
+        values = self._values[field]
+        first, last = self._range(start, end)
+        result = []
+        for position in range(first, last):
+            index = self._index(position)
+            result.append(
+                (self._timestamps[index], self._decode_value(field, values[index]))
+            )
+        return result
+
+    def value_at(self, field: str, timestamp: float) -> Any:
+        """Value of a field at the given time, None when not known."""
+        position = self._bisect(timestamp)
+        if (
+            position < self._size
+            and self._timestamps[self._index(position)] == timestamp
+        ):
+            index = self._index(position)
+        elif position > 0:
+            index = self._index(position - 1)
+        else:
+            return None
+        return self._decode_value(field, self._values[field][index])
+
+    def durations(
+        self, field: str, start: Optional[float] = None, end: Optional[float] = None
+    ) -> Dict[Any, float]:
+        """Seconds spent with each value of a field in [start, end)."""
+        result: Dict[Any, float] = {}
+        for value, begin, finish in self._intervals(field, start, end):
+            result[value] = result.get(value, 0.0) + finish - begin
+        return result
+
+    def aggregate(
+        self, field: str, start: Optional[float] = None, end: Optional[float] = None
+    ) -> Optional[Aggregate]:
+        """Minimum, maximum and time weighted mean of a numeric field in [start, end)."""
+        if field in self._codes:
+            raise ValueError(f"{field} is not a numeric field")
+        minimum: Optional[float] = None
+        maximum: Optional[float] = None
+        weighted = 0.0
+        total = 0.0
+        count = 0
+        for value, begin, finish in self._intervals(field, start, end):
+            if value is None:
+                continue
+            minimum = value if minimum is None else min(minimum, value)
+            maximum = value if maximum is None else max(maximum, value)
+            weighted += value * (finish - begin)
+            total += finish - begin
+            count += 1
+        if minimum is None or maximum is None:
+            return None
+        mean = weighted / total if total > 0 else float(minimum)
+        return Aggregate(minimum, maximum, mean, count)
+
+    def _intervals(
+        self, field: str, start: Optional[float], end: Optional[float]
+    ) -> List[Tuple[Any, float, float]]:
+        """(value, begin, end) intervals during which the field had a value."""
+        if self._size == 0:
+            return []
+        values = self._values[field]
+        if end is None:
+            end = self._last_time if self._last_time is not None else time.time()
+        first, last = self._range(start, end)
+
+        # The sample before the range determines the value at the start of the range
+        if first > 0 and start is not None:
+            first -= 1
+
+        intervals = []
+        for position in range(first, last):
+            index = self._index(position)
+            begin = self._timestamps[index]
+            if start is not None:
+                begin = max(begin, start)
+            if position + 1 < self._size:
+                finish = min(self._timestamps[self._index(position + 1)], end)
+            else:
+                finish = end
+            # Samples before start or at end have no duration in the range
+            if finish > begin:
+                intervals.append(
+                    (self._decode_value(field, values[index]), begin, finish)
+                )
+        return intervals
@@ -1,13 +1,19 @@
-from typing import Dict, List
-from .helpers import generate_attribute_string
+from typing import Dict, List, Optional
+from .helpers import generate_attribute_string, optional, required
 
 
 class Group:
     """Represent a group on the Hue bridge"""
 
+    __slots__ = ("_id", "_raw", "_name", "_num_lights", "_active", "_owner")
+
     def __init__(self, id: str, raw) -> None:
         self._id = id
         self._raw = raw
+        self._name = required(raw, "name", str)
+        self._num_lights = required(raw, "numLights", int)
+        self._active = required(raw, "active", bool)
+        self._owner = optional(raw, "owner", str)
 
     @property
     def id(self) -> str:
@@ -17,17 +23,17 @@ class Group:
     @property
     def name(self) -> str:
         """Friendly name of the entertainment group."""
-        return self._raw["name"]
+        return self._name
 
     @property
     def num_lights(self) -> int:
         """Number of lights in the entertainment group."""
-        return self._raw["numLights"]
+        return self._num_lights
 
     @property
     def active(self) -> bool:
         """Indicates if the group is actively streaming (either from Syncbox or other source)."""
-        return self._raw["active"]
+        return self._active
 
     @property
     def owner(self) -> str | None:
@@ -35,7 +41,7 @@ class Group:
         User friendly name of the application that is streaming on the associated bridge.
         Only exposed if active is true
         """
-        return self._raw["owner"] if "owner" in self._raw else None
+        return self._owner
 
 
 class Hue:
@@ -44,7 +50,7 @@ class Hue:
     def __init__(self, raw, request) -> None:
         self._raw = raw
         self._request = request
-        self._groups = Hue._build_groups(self._raw)
+        self._parse()
 
     def __str__(self) -> str:
         attributes = [
@@ -60,10 +66,18 @@ class Hue:
             return NotImplemented
         return self._raw == other._raw
 
+    def _parse(self) -> None:
+        raw = self._raw
+        self._bridge_unique_id = optional(raw, "bridgeUniqueId", str)
+        self._bridge_ip_address = optional(raw, "bridgeIpAddress", str)
+        # Connection state is kept as string so new states do not break parsing
+        self._connection_state = required(raw, "connectionState", str)
+        self._groups = Hue._build_groups(raw)
+
     @staticmethod
     def _build_groups(raw) -> List[Group]:
         groups = []
-        for key, value in raw["groups"].items():
+        for key, value in (optional(raw, "groups", dict) or {}).items():
             groups.append(Group(key, value))
         return groups
 
@@ -71,19 +85,19 @@ class Hue:
         await self._request("put", "/hue", data=data)
 
     @property
-    def bridge_unique_id(self) -> str:
+    def bridge_unique_id(self) -> Optional[str]:
         """16 character ascii hex string bridge identifier."""
-        return self._raw["bridgeUniqueId"]
+        return self._bridge_unique_id
 
     @property
-    def bridge_ip_address(self) -> str:
+    def bridge_ip_address(self) -> Optional[str]:
         """Readable, dot IPv4 address of the paired bridge EG 192.168.1.50."""
-        return self._raw["bridgeIpAddress"]
+        return self._bridge_ip_address
 
     @property
     def connection_state(self) -> str:
         """uninitialized, disconnected, connecting, unauthorized, connected, invalidgroup, streaming"""
-        return self._raw["connectionState"]
+        return self._connection_state
 
     @property
     def groups(self) -> List[Group]:
@@ -121,4 +135,4 @@ class Hue:
         response = await self._request("get", "/hue")
         if response:
             self._raw = response
-            self._groups = Hue._build_groups(self._raw)
+            self._parse()
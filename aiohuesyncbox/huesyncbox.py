@@ -1,7 +1,10 @@
 import asyncio
+import inspect
+import json
 import logging
 import ssl
-from typing import Dict, Optional
+import time
+from typing import Any, Callable, Dict, List, Optional
 
 import aiohttp
 
@@ -10,8 +13,13 @@ from .device import Device
 from .execution import Execution
 from .hue import Hue
 from .hdmi import Hdmi
-from .errors import raise_error, RequestError, Unauthorized
+from .errors import raise_error, AiohuesyncboxException, RequestError, Unauthorized
+from .health import BoxHealth
+from .helpers import required
 from .hsb_cacert import HSB_CACERT
+from .ratelimit import RateLimiter
+from .stats import ConnectionStats, RequestStats
+from .transport import Response, Transport
 
 MIN_API_LEVEL = 4
 
@@ -28,14 +36,39 @@ class HueSyncBox:
         access_token: Optional[str] = None,
         port: int = 443,
         path: str = "/api",
+        warm_up: bool = False,
+        keep_alive: Optional[float] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        transport: Optional[Transport] = None,
     ) -> None:
+        """
+        warm_up : When true open the connection when entering the async context manager
+        keep_alive : Seconds of idle time after which a cheap request is made to keep the connection open.
+            Should be lower than the keepalive timeout of the connection, which is 15 seconds
+        rate_limiter : Limits the rate of requests to protect the box, see RateLimiter
+        transport : Hook to record or replay requests, see RecordingTransport and ReplayTransport
+        """
+        if keep_alive is not None and keep_alive <= 0:
+            raise ValueError("keep_alive must be a positive number of seconds")
+
         self._host = host
         self._id = id
         self._access_token = access_token
         self._port = port
         self._path = path
+        self._warm_up = warm_up
+        self._keep_alive = keep_alive
+        self._rate_limiter = rate_limiter
+        self._transport = transport
 
         self._clientsession: aiohttp.ClientSession | None = None
+        self._clientsession_lock: asyncio.Lock | None = None
+        self._keep_alive_task: asyncio.Task | None = None
+        self._last_request_time = 0.0
+        self._connection_stats = ConnectionStats()
+        self._request_stats = RequestStats()
+        self._health = BoxHealth()
+        self._update_listeners: List[Callable[["HueSyncBox"], Any]] = []
 
         # API endpoints
         self.behavior: Behavior
@@ -47,6 +80,9 @@ class HueSyncBox:
         self._last_response = None  # For debugging purposes
 
     async def __aenter__(self):
+        if self._warm_up:
+            await self.warm_up()
+        self._start_keep_alive()
         return self
 
     async def __aexit__(self, exc_type, exc, tb):
@@ -72,10 +108,66 @@ class HueSyncBox:
             limit_per_host=1,  # Syncbox can handle a limited amount of connections, only take what we need
         )
 
+        stats = self._connection_stats
+
+        async def _on_connection_create_end(session, context, params) -> None:
+            stats.connections_created += 1
+
+        async def _on_connection_reuseconn(session, context, params) -> None:
+            stats.connections_reused += 1
+
+        trace_config = aiohttp.TraceConfig()
+        trace_config.on_connection_create_end.append(_on_connection_create_end)
+        trace_config.on_connection_reuseconn.append(_on_connection_reuseconn)
+
         return aiohttp.ClientSession(
-            connector=connector, timeout=aiohttp.ClientTimeout(total=10)
+            connector=connector,
+            timeout=aiohttp.ClientTimeout(total=10),
+            trace_configs=[trace_config],
         )
 
+    def _start_keep_alive(self) -> None:
+        if self._keep_alive is None or self._keep_alive_task is not None:
+            return
+        # Idle time counts from now, not from creation of the object
+        self._last_request_time = time.monotonic()
+        self._keep_alive_task = asyncio.create_task(self._keep_alive_loop())
+
+    async def _keep_alive_loop(self) -> None:
+        assert self._keep_alive is not None
+        while True:
+            idle = time.monotonic() - self._last_request_time
+            if idle < self._keep_alive:
+                await asyncio.sleep(self._keep_alive - idle)
+                continue
+            try:
+                self._connection_stats.keep_alive_pings += 1
+                await self.request("get", "/execution")
+            except AiohuesyncboxException as err:
+                logger.debug("Keep alive request failed, %s", err)
+                # Avoid retrying in a tight loop when the box is not reachable
+                self._last_request_time = time.monotonic()
+            except Exception:
+                # E.g. an invalid body, keep the task running
+                logger.exception("Keep alive request failed")
+                self._last_request_time = time.monotonic()
+
+    async def warm_up(self) -> None:
+        """Open the connection to the box so the first real request does not have to."""
+        try:
+            await self.request("get", "/execution")
+        except AiohuesyncboxException as err:
+            # An error response still leaves a usable connection
+            logger.debug("Warm up request failed, %s", err)
+
+    @property
+    def id(self) -> str:
+        return self._id
+
+    @property
+    def host(self) -> str:
+        return self._host
+
     @property
     def access_token(self) -> str | None:
         return self._access_token
@@ -84,6 +176,18 @@ class HueSyncBox:
     def last_response(self) -> Dict | None:
         return self._last_response
 
+    @property
+    def connection_stats(self) -> ConnectionStats:
+        return self._connection_stats
+
+    @property
+    def request_stats(self) -> RequestStats:
+        return self._request_stats
+
+    @property
+    def health(self) -> BoxHealth:
+        return self._health
+
     async def is_registered(self):
         try:
             await self.request("get", "/registrations")
@@ -130,8 +234,25 @@ class HueSyncBox:
         """Unregister application from the huesyncbox, you can only unregister the id associated with the token in use."""
         await self.request("delete", f"/registrations/{registration_id}")
 
+    def add_update_listener(
+        self, listener: Callable[["HueSyncBox"], Any]
+    ) -> Callable[[], None]:
+        """
+        Add a listener that is called with the box after each successful `update()`.
+
+        The listener may be a coroutine function. Returns a function to remove the listener.
+        """
+        self._update_listeners.append(listener)
+
+        def _remove() -> None:
+            if listener in self._update_listeners:
+                self._update_listeners.remove(listener)
+
+        return _remove
+
     async def initialize(self):
         await self.update()
+        self._start_keep_alive()
         if self.device.api_level < MIN_API_LEVEL:
             logger.error(
                 "This library requires at least API version %s. Please update the Philips Hue Play HDMI Sync Box.",
@@ -139,6 +260,12 @@ class HueSyncBox:
             )
 
     async def close(self):
+        if self._keep_alive_task is not None:
+            task = self._keep_alive_task
+            self._keep_alive_task = None
+            task.cancel()
+            # A running keep alive request must be done before the session closes
+            await asyncio.gather(task, return_exceptions=True)
         if self._clientsession is not None:
             await self._clientsession.close()
 
@@ -147,57 +274,120 @@ class HueSyncBox:
         self._last_response = response
 
         if response:
-            self.behavior = Behavior(response["behavior"], self.request)
-            self.device = Device(response["device"], self.request)
-            self.execution = Execution(response["execution"], self.request)
-            self.hue = Hue(response["hue"], self.request)
-            self.hdmi = Hdmi(response["hdmi"], self.request)
+            self.behavior = Behavior(required(response, "behavior", dict), self.request)
+            self.device = Device(required(response, "device", dict), self.request)
+            execution = Execution(required(response, "execution", dict), self.request)
+            if hasattr(self, "execution"):
+                # Share the running brightness transition, so commands on the new object cancel it
+                execution._transition = self.execution._transition
+            self.execution = execution
+            self.hue = Hue(required(response, "hue", dict), self.request)
+            self.hdmi = Hdmi(required(response, "hdmi", dict), self.request)
+            self._health.record_state(
+                self.device.wifi.strength if self.device.wifi is not None else None,
+                self.hue.connection_state,
+            )
+
+            for listener in list(self._update_listeners):
+                try:
+                    result = listener(self)
+                    if inspect.isawaitable(result):
+                        await result
+                except Exception:
+                    # A failing listener must not break updating the box
+                    logger.exception("Update listener %s failed", listener)
 
     async def request(
-        self, method: str, path: str, data: Optional[Dict] = None, auth: bool = True
+        self,
+        method: str,
+        path: str,
+        data: Optional[Dict] = None,
+        auth: bool = True,
+        priority: bool = False,
     ):
-        """Make a request to the API."""
+        """
+        Make a request to the API.
 
-        if self._clientsession is None:
-            self._clientsession = await self._get_clientsession()
-            assert self._clientsession is not None
+        priority : Do not wait for the rate limiter, also see `ratelimit.priority()`
+        """
 
-        if self._clientsession.closed:
-            # Avoid runtime errors when connection is closed.
-            # This solves an issue when Updates were scheduled and HA was shutdown
-            return None
+        if path == "/execution" and method.lower() != "get":
+            # Any other change of execution cancels a running brightness transition,
+            # also when it does not come from the Execution object, e.g. a Preset
+            execution: Optional[Execution] = getattr(self, "execution", None)
+            if execution is not None:
+                execution._cancel_transition()
 
-        url = f"https://{self._host}:{self._port}{self._path}/v1{path}"
+        if self._rate_limiter is not None:
+            await self._rate_limiter.acquire(method, priority)
+
+        self._last_request_time = time.monotonic()
+
+        headers = {"Content-Type": "application/json"}
+        if auth and self._access_token:
+            headers["Authorization"] = f"Bearer {self._access_token}"
 
+        start = time.monotonic()
+        error = True
         try:
-            logger.debug("%s, %s, %s" % (method, url, data))
-
-            headers = {"Content-Type": "application/json"}
-            if auth and self._access_token:
-                headers["Authorization"] = f"Bearer {self._access_token}"
-
-            async with self._clientsession.request(
-                method, url, json=data, headers=headers, server_hostname=self._id
-            ) as resp:
-                logger.debug("%s, %s" % (resp.status, await resp.text("utf-8")))
-
-                data = None
-                if resp.content_type == "application/json":
-                    data = await resp.json()
-                    if resp.status != 200:
-                        if isinstance(data, dict):
-                            _raise_on_error(data)
-                        else:
-                            logger.error(
-                                "Received unexpected data format: %s" % str(data)
-                            )
-                return data
+            if self._transport is not None:
+                response = await self._transport.send(
+                    method, path, data, headers, self._send
+                )
+            else:
+                response = await self._send(method, path, data, headers)
+            error = response is not None and response.status != 200
         except aiohttp.ClientError as err:
             logger.debug(err, exc_info=True)
             raise RequestError(f"Error requesting data from {self._host}") from err
         except asyncio.TimeoutError as err:
             logger.debug(err, exc_info=True)
             raise RequestError(f"Timeout requesting data from {self._host}") from err
+        finally:
+            latency = time.monotonic() - start
+            self._request_stats.record(latency, error)
+            self._health.record_request(latency, error)
+
+        if response is None:
+            return None
+
+        data = None
+        if response.content_type == "application/json":
+            data = json.loads(response.body)
+            if response.status != 200:
+                if isinstance(data, dict):
+                    _raise_on_error(data)
+                else:
+                    logger.error("Received unexpected data format: %s" % str(data))
+        return data
+
+    async def _send(
+        self, method: str, path: str, data: Optional[Dict], headers: Dict[str, str]
+    ) -> Optional[Response]:
+        """Send a request over the network."""
+        if self._clientsession is None:
+            # Concurrent requests must not each create a clientsession
+            if self._clientsession_lock is None:
+                self._clientsession_lock = asyncio.Lock()
+            async with self._clientsession_lock:
+                if self._clientsession is None:
+                    self._clientsession = await self._get_clientsession()
+            assert self._clientsession is not None
+
+        if self._clientsession.closed:
+            # Avoid runtime errors when connection is closed.
+            # This solves an issue when Updates were scheduled and HA was shutdown
+            return None
+
+        url = f"https://{self._host}:{self._port}{self._path}/v1{path}"
+        logger.debug("%s, %s, %s" % (method, url, data))
+
+        async with self._clientsession.request(
+            method, url, json=data, headers=headers, server_hostname=self._id
+        ) as resp:
+            body = await resp.read()
+            logger.debug("%s, %s" % (resp.status, body.decode("utf-8", "replace")))
+            return Response(resp.status, resp.content_type, body)
 
 
 def _raise_on_error(data: Dict):
@@ -0,0 +1,205 @@
+"""Export the state of huesyncboxes in the OpenMetrics text format."""
+
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .hdmi import INPUTS
+from .stats import LATENCY_BUCKETS
+
+CONTENT_TYPE = "application/openmetrics-text; version=1.0.0; charset=utf-8"
+
+# (name, type, help) of the metric families in output order
+STATE_FAMILIES: List[Tuple[str, str, str]] = [
+    ("huesyncbox_mode", "gauge", "Current mode, 1 for the active mode."),
+    ("huesyncbox_brightness", "gauge", "Brightness, 0-200."),
+    ("huesyncbox_sync_active", "gauge", "1 when syncing."),
+    (
+        "huesyncbox_input_status",
+        "gauge",
+        "Status of the HDMI inputs, 1 for the status.",
+    ),
+    ("huesyncbox_wifi_strength", "gauge", "Wifi strength, 0 (not connected) - 4."),
+    (
+        "huesyncbox_hue_connection_state",
+        "gauge",
+        "Connection state with the Hue bridge, 1 for the state.",
+    ),
+    ("huesyncbox_api_level", "gauge", "API level of the box."),
+]
+STATS_FAMILIES: List[Tuple[str, str, str]] = [
+    ("huesyncbox_requests", "counter", "Requests made to the box."),
+    ("huesyncbox_request_errors", "counter", "Requests that failed."),
+    ("huesyncbox_request_duration_seconds", "histogram", "Duration of requests."),
+    ("huesyncbox_health_score", "gauge", "Health of the box, 0 (bad) - 1 (healthy)."),
+]
+
+
+def _escape(value: Any) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _sample(name: str, labels: Dict[str, Any], value: Any) -> str:
+    label_string = ",".join(f'{key}="{_escape(val)}"' for key, val in labels.items())
+    if isinstance(value, bool):
+        value = int(value)
+    return f"{name}{{{label_string}}} {value}"
+
+
+class _BoxEntry:
+    __slots__ = ("box", "label", "remove_listener", "state", "stats", "stats_key")
+
+    def __init__(self, box: Any, label: str, remove_listener: Callable) -> None:
+        self.box = box
+        self.label = label
+        self.remove_listener = remove_listener
+        self.state: Optional[Dict[str, List[str]]] = None
+        self.stats: Optional[Dict[str, List[str]]] = None
+        self.stats_key: Optional[Tuple[int, int]] = None
+
+
+class MetricsExporter:
+    """
+    Renders the state and request statistics of boxes as OpenMetrics text, e.g. for Prometheus.
+
+    The lines of each box are cached. State lines are only rebuilt after an update of the box
+    and statistics lines only when requests were made, so rendering is cheap for large fleets.
+    """
+
+    def __init__(self) -> None:
+        self._boxes: Dict[int, _BoxEntry] = {}
+        self._output: Optional[str] = None
+
+    def add_box(self, box: Any, label: Optional[str] = None) -> None:
+        """Export a HueSyncBox, label defaults to the id of the box."""
+        if id(box) in self._boxes:
+            return
+        entry: _BoxEntry
+
+        def _invalidate(_box: Any) -> None:
+            entry.state = None
+
+        remove_listener = box.add_update_listener(_invalidate)
+        entry = _BoxEntry(box, label or box.id, remove_listener)
+        self._boxes[id(box)] = entry
+        self._output = None
+
+    def remove_box(self, box: Any) -> None:
+        entry = self._boxes.pop(id(box), None)
+        if entry is not None:
+            entry.remove_listener()
+            self._output = None
+
+    def _build_state(self, entry: _BoxEntry) -> Dict[str, List[str]]:
+        box = entry.box
+        labels = {"box": entry.label}
+        lines: Dict[str, List[str]] = {name: [] for name, _, _ in STATE_FAMILIES}
+
+        execution = getattr(box, "execution", None)
+        if execution is not None:
+            lines["huesyncbox_mode"].append(
+                _sample("huesyncbox_mode", {**labels, "mode": execution.mode}, 1)
+            )
+            lines["huesyncbox_brightness"].append(
+                _sample("huesyncbox_brightness", labels, execution.brightness)
+            )
+            lines["huesyncbox_sync_active"].append(
+                _sample("huesyncbox_sync_active", labels, execution.sync_active)
+            )
+
+        hdmi = getattr(box, "hdmi", None)
+        if hdmi is not None:
+            for input_id in INPUTS:
+                input = getattr(hdmi, input_id)
+                if input is not None:
+                    lines["huesyncbox_input_status"].append(
+                        _sample(
+                            "huesyncbox_input_status",
+                            {**labels, "input": input_id, "status": input.status},
+                            1,
+                        )
+                    )
+
+        device = getattr(box, "device", None)
+        if device is not None:
+            if device.wifi is not None:
+                lines["huesyncbox_wifi_strength"].append(
+                    _sample("huesyncbox_wifi_strength", labels, device.wifi.strength)
+                )
+            lines["huesyncbox_api_level"].append(
+                _sample("huesyncbox_api_level", labels, device.api_level)
+            )
+
+        hue = getattr(box, "hue", None)
+        if hue is not None:
+            lines["huesyncbox_hue_connection_state"].append(
+                _sample(
+                    "huesyncbox_hue_connection_state",
+                    {**labels, "state": hue.connection_state},
+                    1,
+                )
+            )
+        return lines
+
+    def _build_stats(self, entry: _BoxEntry) -> Dict[str, List[str]]:
+        stats = entry.box.request_stats
+        labels = {"box": entry.label}
+        histogram = "huesyncbox_request_duration_seconds"
+        lines = {
+            "huesyncbox_requests": [
+                _sample("huesyncbox_requests_total", labels, stats.requests)
+            ],
+            "huesyncbox_request_errors": [
+                _sample("huesyncbox_request_errors_total", labels, stats.errors)
+            ],
+            histogram: [],
+            "huesyncbox_health_score": [
+                _sample(
+                    "huesyncbox_health_score",
+                    labels,
+                    round(entry.box.health.score, 3),
+                )
+            ],
+        }
+        cumulative = 0
+        for bound, count in zip(LATENCY_BUCKETS, stats.latency_buckets):
+            cumulative += count
+            lines[histogram].append(
+                _sample(f"{histogram}_bucket", {**labels, "le": bound}, cumulative)
+            )
+        lines[histogram].append(
+            _sample(f"{histogram}_bucket", {**labels, "le": "+Inf"}, stats.requests)
+        )
+        lines[histogram].append(_sample(f"{histogram}_count", labels, stats.requests))
+        lines[histogram].append(
+            _sample(f"{histogram}_sum", labels, round(stats.latency_sum, 6))
+        )
+        return lines
+
+    def render(self) -> str:
+        """Metrics of all boxes in OpenMetrics text format, see CONTENT_TYPE."""
+        for entry in self._boxes.values():
+            if entry.state is None:
+                entry.state = self._build_state(entry)
+                self._output = None
+            stats = entry.box.request_stats
+            stats_key = (stats.requests, stats.errors)
+            if entry.stats is None or entry.stats_key != stats_key:
+                entry.stats = self._build_stats(entry)
+                entry.stats_key = stats_key
+                self._output = None
+
+        if self._output is not None:
+            return self._output
+
+        output: List[str] = []
+        for families, attribute in (
+            (STATE_FAMILIES, "state"),
+            (STATS_FAMILIES, "stats"),
+        ):
+            for name, type, help in families:
+                output.append(f"# TYPE {name} {type}")
+                output.append(f"# HELP {name} {help}")
+                for entry in self._boxes.values():
+                    output.extend(getattr(entry, attribute)[name])
+        output.append("# EOF\n")
+        self._output = "\n".join(output)
+        return self._output
@@ -0,0 +1,117 @@
+"""Apply a combined state to a huesyncbox with as few requests as possible."""
+
+import asyncio
+from typing import TYPE_CHECKING, Any, Awaitable, Dict, List, Optional
+
+if TYPE_CHECKING:
+    from .huesyncbox import HueSyncBox
+
+
+def _changed(raw: Dict, desired: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        key: value
+        for key, value in desired.items()
+        if value is not None and raw.get(key) != value
+    }
+
+
+class Preset:
+    """
+    Desired state of a huesyncbox, e.g. a "movie night" scene.
+
+    Only fields that are set are applied. When applying, the preset is compared with
+    the state from the last update of the box and only the fields that differ are sent.
+    Fields of the same resource are combined in a single request and requests for
+    different resources are sent concurrently. A box handles the requests of a HueSyncBox
+    one at a time over a single connection, so the gain comes from sending fewer requests.
+    """
+
+    def __init__(
+        self,
+        sync_active: Optional[bool] = None,
+        hdmi_active: Optional[bool] = None,
+        mode: Optional[str] = None,
+        hdmi_source: Optional[str] = None,
+        brightness: Optional[int] = None,
+        intensity: Optional[str] = None,
+        hue_target: Optional[str] = None,
+        led_mode: Optional[int] = None,
+        force_dovi_native: Optional[int] = None,
+        groups_active: Optional[Dict[str, bool]] = None,
+    ) -> None:
+        self.sync_active = sync_active
+        self.hdmi_active = hdmi_active
+        self.mode = mode
+        self.hdmi_source = hdmi_source
+        self.brightness = brightness
+        self.intensity = intensity
+        self.hue_target = hue_target
+        self.led_mode = led_mode
+        self.force_dovi_native = force_dovi_native
+        self.groups_active = groups_active or {}
+
+    def _execution_changes(self, raw: Dict) -> Dict[str, Any]:
+        data = _changed(
+            raw,
+            {
+                "syncActive": self.sync_active,
+                "hdmiActive": self.hdmi_active,
+                "mode": self.mode,
+                "hdmiSource": self.hdmi_source,
+                "brightness": self.brightness,
+                "hueTarget": self.hue_target,
+            },
+        )
+        if self.intensity is not None:
+            # Intensity is stored per sync mode, compare with the mode that will be active
+            mode = self.mode if self.mode is not None else raw.get("mode")
+            syncmode = raw.get(mode) if mode is not None else None
+            if (
+                not isinstance(syncmode, dict)
+                or syncmode.get("intensity") != self.intensity
+            ):
+                data["intensity"] = self.intensity
+        return data
+
+    def changes(self, box: "HueSyncBox") -> Dict[str, Dict[str, Any]]:
+        """
+        Requests needed to bring the box in the state of the preset.
+
+        Returns a dictionary with the request path as key and the data to PUT as value.
+        """
+        requests = {}
+
+        execution = self._execution_changes(box.execution._raw)
+        if execution:
+            requests["/execution"] = execution
+
+        device = _changed(box.device._raw, {"ledMode": self.led_mode})
+        if device:
+            requests["/device"] = device
+
+        behavior = _changed(
+            box.behavior._raw, {"forceDoviNative": self.force_dovi_native}
+        )
+        if behavior:
+            requests["/behavior"] = behavior
+
+        groups = box.hue._raw.get("groups", {})
+        for id, active in self.groups_active.items():
+            group = _changed(groups.get(id, {}), {"active": active})
+            if group:
+                requests[f"/hue/groups/{id}"] = group
+
+        return requests
+
+    async def apply(self, box: "HueSyncBox") -> List[str]:
+        """
+        Apply the preset to the box.
+
+        The box must have been initialized. Returns the paths of the resources that were changed.
+        """
+        requests = self.changes(box)
+        calls: List[Awaitable] = [
+            box.request("put", path, data=data) for path, data in requests.items()
+        ]
+        await asyncio.gather(*calls)
+        return list(requests)
@@ -0,0 +1,100 @@
+"""Limit the rate of requests to a huesyncbox."""
+
+import asyncio
+import contextlib
+import contextvars
+import time
+from typing import Iterator
+
+_priority = contextvars.ContextVar("aiohuesyncbox_priority", default=False)
+
+
+@contextlib.contextmanager
+def priority() -> Iterator[None]:
+    """
+    Requests made within this context skip waiting for the rate limiter, e.g. for user commands.
+
+        with priority():
+            await box.execution.set_state(mode="video")
+    """
+    token = _priority.set(True)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+
+def is_priority() -> bool:
+    return _priority.get()
+
+
+class TokenBucket:
+    """
+    Token bucket that allows `burst` requests at once and refills with `rate` tokens per second.
+
+    Waiters are served in order of arrival.
+    """
+
+    def __init__(self, rate: float, burst: int) -> None:
+        if rate <= 0:
+            raise ValueError("rate must be larger than 0")
+        if burst < 1:
+            raise ValueError("burst must be at least 1")
+        self._rate = rate
+        self._burst = burst
+        self._tokens = float(burst)
+        self._last_refill = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(
+            self._burst, self._tokens + (now - self._last_refill) * self._rate
+        )
+        self._last_refill = now
+
+    @property
+    def tokens(self) -> float:
+        self._refill()
+        return self._tokens
+
+    async def acquire(self, priority: bool = False) -> None:
+        """
+        Take a token, waits until one is available.
+
+        With priority the token is taken without waiting. The bucket can go into debt
+        so the priority request still counts against the budget of later requests.
+        """
+        if priority:
+            self._refill()
+            self._tokens = max(self._tokens - 1, -self._burst)
+            return
+
+        async with self._lock:
+            self._refill()
+            while self._tokens < 1:
+                await asyncio.sleep((1 - self._tokens) / self._rate)
+                self._refill()
+            self._tokens -= 1
+
+
+class RateLimiter:
+    """
+    Separate request budgets for reads (GET) and writes (PUT, POST, DELETE) of a single box.
+
+    Requests made in a `priority()` context are not delayed.
+    """
+
+    def __init__(
+        self,
+        read_rate: float = 2.0,
+        read_burst: int = 4,
+        write_rate: float = 5.0,
+        write_burst: int = 5,
+    ) -> None:
+        self._read_bucket = TokenBucket(read_rate, read_burst)
+        self._write_bucket = TokenBucket(write_rate, write_burst)
+
+    async def acquire(self, method: str, priority: bool = False) -> None:
+        bucket = self._read_bucket if method.lower() == "get" else self._write_bucket
+        await bucket.acquire(priority or is_priority())
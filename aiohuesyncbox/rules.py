@@ -0,0 +1,217 @@
+"""Run automations on the state of huesyncboxes after each update."""
+
+import asyncio
+import logging
+import time
+import weakref
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set, Union
+
+from .helpers import resolve_path
+
+logger = logging.getLogger(__name__)
+
+Condition = Union[Callable[[Any], bool], Any]
+Action = Union[Callable[[Any], Awaitable[Any]], Dict[str, Any]]
+
+
+class Rule:
+    """
+    Run an action when a field of a box starts matching a condition.
+
+    field : Dotted path of the watched field, e.g. "hdmi.input3.status"
+    condition : Value to compare with, or a function that gets the value and returns a bool
+    action : Keyword arguments for `execution.set_state()`, or a coroutine function that gets the box
+    debounce : Seconds the condition must keep matching before the action runs
+    cooldown : Minimum seconds between two runs of the action
+
+    The action runs once each time the condition starts matching, it is not repeated
+    while the condition keeps matching.
+    """
+
+    def __init__(
+        self,
+        field: str,
+        condition: Condition,
+        action: Action,
+        debounce: float = 0.0,
+        cooldown: float = 0.0,
+        name: Optional[str] = None,
+    ) -> None:
+        self.field = field
+        self.condition = condition
+        self.action = action
+        self.debounce = debounce
+        self.cooldown = cooldown
+        self.name = name or f"{field}"
+
+    def __repr__(self) -> str:
+        return f"Rule({self.name!r})"
+
+    def matches(self, value: Any) -> bool:
+        if callable(self.condition):
+            return bool(self.condition(value))
+        return value == self.condition
+
+    async def run(self, box: Any) -> None:
+        if callable(self.action):
+            await self.action(box)
+        else:
+            await box.execution.set_state(**self.action)
+
+
+class _RuleState:
+    __slots__ = ("matching_since", "done", "last_run")
+
+    def __init__(self) -> None:
+        self.matching_since: Optional[float] = None
+        self.done = False
+        self.last_run: Optional[float] = None
+
+
+class _BoxState:
+    __slots__ = ("values", "rules", "pending", "unevaluated", "timer", "task")
+
+    def __init__(self) -> None:
+        self.values: Dict[str, Any] = {}
+        self.rules: Dict[Rule, _RuleState] = {}
+        self.pending: Set[Rule] = set()
+        # Rules added after the first update that were not evaluated yet
+        self.unevaluated: Set[Rule] = set()
+        self.timer: Optional[asyncio.TimerHandle] = None
+        self.task: Optional[asyncio.Task] = None
+
+
+class RulesEngine:
+    """
+    Evaluates rules against the state of boxes after each update.
+
+    Rules are indexed by the field they watch, so on each update only the rules
+    of fields that changed are evaluated. Rules waiting for their debounce or cooldown
+    are evaluated again as soon as it ends, they do not wait for the next update.
+    An engine can be used for multiple boxes, the state of the rules is kept per box.
+    The state of the first update is used as the starting point, it does not run actions.
+    The same goes for rules that are added later, their first evaluation for a box is their starting point.
+
+        engine = RulesEngine()
+        engine.add_rule(Rule("hdmi.input3.status", "linked", {"hdmi_source": "input3", "mode": "video"}))
+        box.add_update_listener(engine.process)
+    """
+
+    def __init__(self) -> None:
+        self._rules: Dict[str, List[Rule]] = {}
+        self._boxes: "weakref.WeakKeyDictionary[Any, _BoxState]" = (
+            weakref.WeakKeyDictionary()
+        )
+
+    @property
+    def rules(self) -> List[Rule]:
+        return [rule for rules in self._rules.values() for rule in rules]
+
+    def add_rule(self, rule: Rule) -> Callable[[], None]:
+        """Add a rule. Returns a function to remove the rule."""
+        self._rules.setdefault(rule.field, []).append(rule)
+        for state in self._boxes.values():
+            state.unevaluated.add(rule)
+
+        def _remove() -> None:
+            rules = self._rules.get(rule.field, [])
+            if rule in rules:
+                rules.remove(rule)
+                if not rules:
+                    del self._rules[rule.field]
+            for state in self._boxes.values():
+                state.rules.pop(rule, None)
+                state.pending.discard(rule)
+                state.unevaluated.discard(rule)
+
+        return _remove
+
+    async def process(self, box: Any, now: Optional[float] = None) -> List[Rule]:
+        """Evaluate the rules for the current state of the box and run the actions. Returns the rules that ran."""
+        if now is None:
+            now = time.monotonic()
+
+        state = self._boxes.get(box)
+        first = state is None
+        if state is None:
+            state = _BoxState()
+            self._boxes[box] = state
+
+        to_check = set(state.pending)
+        for field, rules in self._rules.items():
+            value = resolve_path(box, field)
+            if first or field not in state.values or state.values[field] != value:
+                state.values[field] = value
+                to_check.update(rules)
+        # Rules added since the previous update still need their starting point
+        to_check.update(state.unevaluated)
+        state.unevaluated.clear()
+
+        to_run = []
+        due: Optional[float] = None
+        for rule in to_check:
+            rule_state = state.rules.get(rule)
+            new = rule_state is None
+            if rule_state is None:
+                rule_state = state.rules[rule] = _RuleState()
+
+            if not rule.matches(state.values[rule.field]):
+                rule_state.matching_since = None
+                rule_state.done = False
+                state.pending.discard(rule)
+                continue
+
+            if rule_state.matching_since is None:
+                rule_state.matching_since = now
+                # Matching from the start is the starting point, not a change
+                rule_state.done = first or new
+            if rule_state.done:
+                state.pending.discard(rule)
+                continue
+
+            rule_due = rule_state.matching_since + rule.debounce
+            if rule_state.last_run is not None:
+                rule_due = max(rule_due, rule_state.last_run + rule.cooldown)
+            if now < rule_due:
+                state.pending.add(rule)
+                due = rule_due if due is None else min(due, rule_due)
+                continue
+
+            state.pending.discard(rule)
+            rule_state.done = True
+            rule_state.last_run = now
+            to_run.append(rule)
+
+        self._schedule(box, state, due, now)
+
+        if to_run:
+            results = await asyncio.gather(
+                *(rule.run(box) for rule in to_run), return_exceptions=True
+            )
+            for rule, result in zip(to_run, results):
+                if isinstance(result, Exception):
+                    logger.warning("Action of %s failed: %s", rule, result)
+        return to_run
+
+    def _schedule(
+        self, box: Any, state: _BoxState, due: Optional[float], now: float
+    ) -> None:
+        """Evaluate the rules of the box again when the first debounce or cooldown ends."""
+        if state.timer is not None:
+            state.timer.cancel()
+            state.timer = None
+        if due is None:
+            return
+
+        # The engine must not keep boxes alive
+        box_ref = weakref.ref(box)
+
+        def _recheck() -> None:
+            state.timer = None
+            box = box_ref()
+            if box is not None and self._boxes.get(box) is state:
+                state.task = asyncio.create_task(self.process(box))
+
+        state.timer = asyncio.get_running_loop().call_later(
+            max(0.0, due - now), _recheck
+        )
@@ -0,0 +1,50 @@
+"""Statistics of the communication with a huesyncbox."""
+
+from dataclasses import dataclass, field
+from typing import List, Tuple
+
+LATENCY_BUCKETS: Tuple[float, ...] = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+@dataclass
+class ConnectionStats:
+    """Connection usage of a HueSyncBox."""
+
+    connections_created: int = 0
+    """New connections, each one includes a TCP connect and TLS handshake."""
+
+    connections_reused: int = 0
+    """Requests that were sent over an already open connection."""
+
+    keep_alive_pings: int = 0
+    """Requests made to keep an idle connection open."""
+
+
+@dataclass
+class RequestStats:
+    """Request counts and latencies of a HueSyncBox."""
+
+    requests: int = 0
+    errors: int = 0
+    """Requests that failed or got an error response."""
+
+    latency_sum: float = 0.0
+    """Total time spent on requests in seconds."""
+
+    latency_buckets: List[int] = field(
+        default_factory=lambda: [0] * len(LATENCY_BUCKETS)
+    )
+    """Number of requests with a latency up to the matching entry in LATENCY_BUCKETS."""
+
+    last_latency: float = 0.0
+
+    def record(self, latency: float, error: bool) -> None:
+        self.requests += 1
+        if error:
+            self.errors += 1
+        self.latency_sum += latency
+        self.last_latency = latency
+        for index, bound in enumerate(LATENCY_BUCKETS):
+            if latency <= bound:
+                self.latency_buckets[index] += 1
+                break
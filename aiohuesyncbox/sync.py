@@ -0,0 +1,138 @@
+"""Synchronous wrapper around HueSyncBox for non-asyncio code."""
+
+import asyncio
+import concurrent.futures
+import threading
+from typing import Any, Awaitable, Callable, Optional, TypeVar
+
+from .huesyncbox import HueSyncBox
+from .ratelimit import RateLimiter
+from .transport import Transport
+
+T = TypeVar("T")
+
+
+class HueSyncBoxSync:
+    """
+    Control a Philips Hue Play HDMI Sync Box from synchronous code.
+
+    The wrapped HueSyncBox lives on an event loop in a background thread that is kept
+    for the lifetime of this object, so the connection to the box stays warm between calls.
+    Instances can be shared between threads. Calls from different threads run concurrently
+    on the loop like concurrent tasks would, so requests of one call can be interleaved with another.
+    """
+
+    def __init__(
+        self,
+        host: str,
+        id: str,
+        access_token: Optional[str] = None,
+        port: int = 443,
+        path: str = "/api",
+        timeout: Optional[float] = None,
+        warm_up: bool = False,
+        keep_alive: Optional[float] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        transport: Optional[Transport] = None,
+    ) -> None:
+        # Create the box first, invalid arguments must not leave a thread running
+        self._box = HueSyncBox(
+            host,
+            id,
+            access_token=access_token,
+            port=port,
+            path=path,
+            keep_alive=keep_alive,
+            rate_limiter=rate_limiter,
+            transport=transport,
+        )
+        self._timeout = timeout
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(
+            target=self._loop.run_forever, name=f"aiohuesyncbox-{id}", daemon=True
+        )
+        self._thread.start()
+        self._close_lock = threading.Lock()
+        if warm_up:
+            self.run(self._box.warm_up())
+        # Keep the connection open from the start, not only after initialize()
+        self._loop.call_soon_threadsafe(self._box._start_keep_alive)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    @property
+    def box(self) -> HueSyncBox:
+        """
+        The wrapped HueSyncBox.
+
+        Reading the model attributes (e.g. `box.execution.mode`) is fine from any thread,
+        coroutines must be executed with `run` or `call`.
+        """
+        return self._box
+
+    @property
+    def closed(self) -> bool:
+        return self._loop.is_closed()
+
+    def run(self, coro: Awaitable[T]) -> T:
+        """Run a coroutine on the background loop and wait for the result."""
+        if self.closed:
+            raise RuntimeError("HueSyncBoxSync is closed")
+        if threading.current_thread() is self._thread:
+            raise RuntimeError("Can not wait for a result on the loop thread")
+        future = asyncio.run_coroutine_threadsafe(coro, self._loop)  # type: ignore[arg-type]
+        try:
+            return future.result(self._timeout)
+        except concurrent.futures.TimeoutError:
+            # Do not leave the coroutine running on the loop
+            future.cancel()
+            raise
+
+    def call(self, func: Callable[[HueSyncBox], Awaitable[T]]) -> T:
+        """
+        Call a coroutine function of the box, e.g.
+        `client.call(lambda box: box.execution.set_state(brightness=100))`
+        """
+
+        async def _call() -> T:
+            return await func(self._box)
+
+        return self.run(_call())
+
+    def is_registered(self) -> bool:
+        return self.run(self._box.is_registered())
+
+    def register(
+        self,
+        application_name: str,
+        instance_name: str,
+        use_registered_token: bool = True,
+    ) -> Any:
+        return self.run(
+            self._box.register(application_name, instance_name, use_registered_token)
+        )
+
+    def unregister(self, registration_id: str) -> None:
+        self.run(self._box.unregister(registration_id))
+
+    def initialize(self) -> None:
+        self.run(self._box.initialize())
+
+    def update(self) -> None:
+        self.run(self._box.update())
+
+    def close(self) -> None:
+        """Close the connection and stop the background thread."""
+        with self._close_lock:
+            if self.closed:
+                return
+            try:
+                self.run(self._box.close())
+            finally:
+                self._loop.call_soon_threadsafe(self._loop.stop)
+                self._thread.join()
+                self._loop.close()
@@ -0,0 +1,220 @@
+"""Pluggable transports to record and replay the traffic of a HueSyncBox."""
+
+import asyncio
+import gzip
+import json
+import time
+from collections import defaultdict, deque
+from typing import (
+    IO,
+    Any,
+    Awaitable,
+    Callable,
+    Deque,
+    Dict,
+    List,
+    NamedTuple,
+    Optional,
+    cast,
+)
+
+from .errors import RequestError
+
+
+class Response(NamedTuple):
+    """Raw response of the box."""
+
+    status: int
+    content_type: str
+    body: bytes
+
+
+Send = Callable[
+    [str, str, Optional[Dict], Dict[str, str]], Awaitable[Optional[Response]]
+]
+
+
+class Transport:
+    """
+    Hook between HueSyncBox.request() and the network.
+
+    `send` is called with the request and a function that sends it over the network.
+    A transport can use that function, wrap it or replace it.
+    """
+
+    async def send(
+        self,
+        method: str,
+        path: str,
+        data: Optional[Dict],
+        headers: Dict[str, str],
+        send: Send,
+    ) -> Optional[Response]:
+        return await send(method, path, data, headers)
+
+    def close(self) -> None:
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+REDACTED = "REDACTED"
+# Keys of which the values are not recorded
+_SECRET_KEYS = ("accessToken",)
+
+
+def _redact(value: Any) -> Any:
+    if isinstance(value, dict):
+        return {
+            key: REDACTED if key in _SECRET_KEYS else _redact(item)
+            for key, item in value.items()
+        }
+    if isinstance(value, list):
+        return [_redact(item) for item in value]
+    return value
+
+
+def _redact_body(body: str) -> str:
+    if not any(key in body for key in _SECRET_KEYS):
+        return body
+    try:
+        return json.dumps(_redact(json.loads(body)))
+    except ValueError:
+        # Not JSON, leave nothing out that could contain the token
+        return REDACTED
+
+
+def _open(filename: str, mode: str) -> IO[str]:
+    if filename.endswith(".gz"):
+        return cast(IO[str], gzip.open(filename, mode + "t", encoding="utf-8"))
+    return open(filename, mode, encoding="utf-8")
+
+
+class RecordingTransport(Transport):
+    """
+    Sends requests over the network and records them to a file.
+
+    Each exchange is stored as one line of JSON with short keys:
+    t (start time relative to the first request), d (duration), m (method), p (path),
+    q (request data), s (status), c (content type), b (body) and e (error, if any).
+    Filenames ending in .gz are compressed. Headers are not recorded and access tokens
+    in request data and bodies, e.g. of POST /registrations, are replaced by REDACTED.
+    """
+
+    def __init__(self, filename: str) -> None:
+        self._file = _open(filename, "w")
+        self._start: Optional[float] = None
+
+    async def send(
+        self,
+        method: str,
+        path: str,
+        data: Optional[Dict],
+        headers: Dict[str, str],
+        send: Send,
+    ) -> Optional[Response]:
+        start = time.monotonic()
+        if self._start is None:
+            self._start = start
+        record: Dict[str, Any] = {
+            "t": round(start - self._start, 6),
+            "m": method.lower(),
+            "p": path,
+            "q": _redact(data),
+        }
+        try:
+            response = await send(method, path, data, headers)
+        except Exception as err:
+            record["d"] = round(time.monotonic() - start, 6)
+            record["e"] = f"{type(err).__name__}: {err}"
+            self._write(record)
+            raise
+        record["d"] = round(time.monotonic() - start, 6)
+        if response is not None:
+            record["s"] = response.status
+            record["c"] = response.content_type
+            record["b"] = _redact_body(response.body.decode("utf-8", "replace"))
+        self._write(record)
+        return response
+
+    def _write(self, record: Dict[str, Any]) -> None:
+        self._file.write(json.dumps(record, separators=(",", ":")) + "\n")
+        self._file.flush()
+
+    def close(self) -> None:
+        self._file.close()
+
+
+class ReplayTransport(Transport):
+    """
+    Answers requests with responses recorded by RecordingTransport, without using the network.
+
+    Requests are matched on method and path, recorded responses for the same method and path
+    are returned in recorded order. With `realtime` the recorded timing is kept, a response
+    is returned at its recorded start time plus duration, relative to the first replayed request.
+    Otherwise responses are returned as fast as possible.
+    With `repeat` the recordings of a method and path, and their timing, start over when exhausted,
+    which is useful for polling loops.
+    """
+
+    def __init__(
+        self, filename: str, realtime: bool = False, repeat: bool = False
+    ) -> None:
+        with _open(filename, "r") as file:
+            self._records: List[Dict[str, Any]] = [
+                json.loads(line) for line in file if line.strip()
+            ]
+        self._realtime = realtime
+        self._repeat = repeat
+        self._queues: Dict[tuple, Deque[Dict[str, Any]]] = defaultdict(deque)
+        for record in self._records:
+            self._queues[(record["m"], record["p"])].append(record)
+        # Monotonic time that corresponds with t = 0 of the recording
+        self._start: Optional[float] = None
+        # Same, for the (method, path) recordings that started over
+        self._starts: Dict[tuple, float] = {}
+
+    @property
+    def records(self) -> List[Dict[str, Any]]:
+        return self._records
+
+    async def send(
+        self,
+        method: str,
+        path: str,
+        data: Optional[Dict],
+        headers: Dict[str, str],
+        send: Send,
+    ) -> Optional[Response]:
+        key = (method.lower(), path)
+        queue = self._queues.get(key)
+        restarted = False
+        if not queue and self._repeat:
+            for record in self._records:
+                if (record["m"], record["p"]) == key:
+                    self._queues[key].append(record)
+            queue = self._queues.get(key)
+            restarted = True
+        if not queue:
+            raise RequestError(f"No recorded response for {method} {path}")
+        record = queue.popleft()
+
+        if self._realtime:
+            now = time.monotonic()
+            offset = record.get("t", 0)
+            if self._start is None:
+                self._start = now - offset
+            if restarted:
+                self._starts[key] = now - offset
+            start = self._starts.get(key, self._start)
+            delay = start + offset + record.get("d", 0) - now
+            await asyncio.sleep(max(0.0, delay))
+        if "e" in record:
+            raise RequestError(f"Recorded error for {method} {path}, {record['e']}")
+        if "s" not in record:
+            return None
+        return Response(record["s"], record["c"], record["b"].encode("utf-8"))
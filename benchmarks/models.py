@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Cost of building the models from a response and of reading their properties.
+
+Run from the repository root:
+
+    python -m benchmarks.models
+"""
+
+import argparse
+import timeit
+
+from aiohuesyncbox import Behavior, Device, Execution, Hdmi, Hue
+
+from .stub import SAMPLE
+
+MODELS = [
+    ("behavior", Behavior),
+    ("device", Device),
+    ("execution", Execution),
+    ("hdmi", Hdmi),
+    ("hue", Hue),
+]
+
+
+def report(name: str, seconds: float, number: int) -> None:
+    print(f"{name:<34} {seconds / number * 1e6:8.3f} us")
+
+
+def main(args) -> None:
+    number = args.number
+
+    print("Parsing, per model")
+    for key, cls in MODELS:
+        raw = SAMPLE[key]
+        report(key, timeit.timeit(lambda: cls(raw, None), number=number), number)
+    report(
+        "full update (all models)",
+        timeit.timeit(
+            lambda: [cls(SAMPLE[key], None) for key, cls in MODELS], number=number
+        ),
+        number,
+    )
+
+    print("Property access")
+    execution = Execution(SAMPLE["execution"], None)
+    device = Device(SAMPLE["device"], None)
+    hdmi = Hdmi(SAMPLE["hdmi"], None)
+    raw = SAMPLE["execution"]
+    report(
+        "raw dict index (baseline)",
+        timeit.timeit(lambda: raw["brightness"], number=number),
+        number,
+    )
+    report(
+        "execution.brightness",
+        timeit.timeit(lambda: execution.brightness, number=number),
+        number,
+    )
+    report(
+        "execution.video.intensity",
+        timeit.timeit(lambda: execution.video.intensity, number=number),
+        number,
+    )
+    report(
+        "device.wifi.strength",
+        timeit.timeit(lambda: device.wifi.strength, number=number),
+        number,
+    )
+    report(
+        "hdmi.input1.status",
+        timeit.timeit(lambda: hdmi.input1.status, number=number),
+        number,
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--number", type=int, default=100000)
+    main(parser.parse_args())
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Latency of applying a multi-resource scene with a Preset compared to separate calls.
+
+Uses a stub box with a fixed latency per request that, like a real box, handles
+one request at a time. Run from the repository root:
+
+    python -m benchmarks.preset_apply --latency 0.05
+"""
+
+import argparse
+import asyncio
+import copy
+import time
+from typing import Any, Dict, Optional
+
+from aiohuesyncbox import HueSyncBox, Preset
+
+from .stub import SAMPLE, StubTransport
+
+
+async def separate_calls(box: HueSyncBox) -> None:
+    await box.execution.set_state(
+        mode="video", hdmi_source="input2", brightness=80, intensity="intense"
+    )
+    await box.device.set_led_mode(0)
+    await box.behavior.set_force_dovi_native(1)
+    await box.hue.set_group_active("7", True)
+
+
+PRESET = Preset(
+    mode="video",
+    hdmi_source="input2",
+    brightness=80,
+    intensity="intense",
+    led_mode=0,
+    force_dovi_native=1,
+    groups_active={"7": True},
+)
+
+# Box on which the execution part of the preset already matches
+PARTLY_APPLIED: Dict[str, Any] = copy.deepcopy(SAMPLE)
+PARTLY_APPLIED["execution"].update(
+    mode="video", hdmiSource="input2", brightness=80, video={"intensity": "intense"}
+)
+
+
+async def measure(
+    name: str, apply, latency: float, rounds: int, state: Optional[Dict] = None
+) -> None:
+    durations = []
+    requests = 0
+    for _ in range(rounds):
+        transport = StubTransport(state, latency=latency)
+        box = HueSyncBox("stub", "stub", transport=transport)
+        await box.initialize()
+        transport.requests.clear()
+
+        start = time.perf_counter()
+        await apply(box)
+        durations.append(time.perf_counter() - start)
+        requests = len(transport.requests)
+        await box.close()
+
+    durations.sort()
+    print(
+        f"{name:<28} requests: {requests}  "
+        f"median: {durations[len(durations) // 2] * 1000:.1f} ms  "
+        f"max: {durations[-1] * 1000:.1f} ms"
+    )
+
+
+async def main(args) -> None:
+    await measure("separate calls", separate_calls, args.latency, args.rounds)
+    await measure("preset", PRESET.apply, args.latency, args.rounds)
+
+    # Only the differences with the current state are sent
+    await measure(
+        "separate calls, partly set",
+        separate_calls,
+        args.latency,
+        args.rounds,
+        PARTLY_APPLIED,
+    )
+    await measure(
+        "preset, partly set", PRESET.apply, args.latency, args.rounds, PARTLY_APPLIED
+    )
+
+    async def already_applied(box: HueSyncBox) -> None:
+        await PRESET.apply(box)
+        await box.update()
+        await PRESET.apply(box)
+
+    await measure("preset twice", already_applied, args.latency, args.rounds)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--rounds", type=int, default=20)
+    asyncio.run(main(parser.parse_args()))
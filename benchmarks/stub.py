@@ -0,0 +1,106 @@
+"""Stub box for benchmarks, answers requests from memory with a configurable latency."""
+
+import asyncio
+import copy
+import json
+from typing import Any, Dict, List, Optional, Tuple
+
+from aiohuesyncbox.transport import Response, Send, Transport
+
+SAMPLE: Dict[str, Any] = {
+    "device": {
+        "name": "Living room",
+        "deviceType": "HSB1",
+        "uniqueId": "C43212345678",
+        "ipAddress": "192.168.1.2",
+        "apiLevel": 7,
+        "firmwareVersion": "1.12.3",
+        "ledMode": 1,
+        "wifi": {"ssid": "network", "strength": 3},
+    },
+    "hue": {
+        "bridgeUniqueId": "001788FFFE000000",
+        "bridgeIpAddress": "192.168.1.3",
+        "connectionState": "connected",
+        "groups": {"7": {"name": "TV", "numLights": 3, "active": False}},
+    },
+    "execution": {
+        "syncActive": False,
+        "hdmiActive": True,
+        "mode": "passthrough",
+        "lastSyncMode": "video",
+        "hdmiSource": "input1",
+        "hueTarget": "groups/7",
+        "brightness": 100,
+        "video": {"intensity": "high"},
+        "game": {"intensity": "high"},
+        "music": {"intensity": "high"},
+    },
+    "hdmi": {
+        "contentSpecs": "1920 x 1080 @ 60000 - SDR",
+        "videoSyncSupported": True,
+        "audioSyncSupported": True,
+        "input1": {
+            "name": "HDMI 1",
+            "type": "generic",
+            "status": "linked",
+            "lastSyncMode": "video",
+        },
+        "input2": {"name": "HDMI 2", "type": "generic", "status": "unplugged"},
+        "input3": {"name": "HDMI 3", "type": "generic", "status": "unplugged"},
+        "input4": {"name": "HDMI 4", "type": "generic", "status": "unplugged"},
+        "output": {"name": "TV", "type": "generic", "status": "linked"},
+    },
+    "behavior": {"forceDoviNative": 0},
+}
+
+
+class StubTransport(Transport):
+    """
+    Keeps the state of a box in memory, GET returns it and PUT updates it.
+
+    Like a real box, which HueSyncBox uses over a single connection, requests are handled
+    one at a time, so concurrent requests wait for each other.
+    """
+
+    def __init__(self, state: Optional[Dict] = None, latency: float = 0.0) -> None:
+        self.state = copy.deepcopy(state if state is not None else SAMPLE)
+        self.latency = latency
+        self.requests: List[Tuple[str, str, Optional[Dict]]] = []
+        # Created on first use so it belongs to the running loop
+        self._lock: Optional[asyncio.Lock] = None
+
+    async def send(
+        self,
+        method: str,
+        path: str,
+        data: Optional[Dict],
+        headers: Dict[str, str],
+        send: Send,
+    ) -> Optional[Response]:
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            self.requests.append((method.lower(), path, data))
+            if self.latency:
+                await asyncio.sleep(self.latency)
+            return self._handle(method, path, data)
+
+    def _handle(self, method: str, path: str, data: Optional[Dict]) -> Response:
+        body: Any = {}
+        if path.startswith("/hue/groups/"):
+            target = self.state["hue"]["groups"][path.rsplit("/", 1)[1]]
+        elif path in ("", "/registrations"):
+            target = self.state if path == "" else {}
+        else:
+            target = self.state[path.lstrip("/")]
+        if method.lower() == "get":
+            body = target
+        elif method.lower() == "put" and data:
+            data = dict(data)
+            if path == "/execution" and "intensity" in data:
+                # Intensity is stored per sync mode
+                mode = data.get("mode", target["mode"])
+                target.setdefault(mode, {})["intensity"] = data.pop("intensity")
+            target.update(data)
+        return Response(200, "application/json", json.dumps(body).encode())
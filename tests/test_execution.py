@@ -0,0 +1,53 @@
+import asyncio
+
+from aiohuesyncbox import HueSyncBox, Preset
+from benchmarks.stub import StubTransport
+
+
+def test_command_after_update_cancels_transition():
+    async def _run():
+        transport = StubTransport(latency=0.01)
+        box = HueSyncBox("10.0.0.1", "box", "token", transport=transport)
+        await box.update()
+
+        transition = asyncio.create_task(box.execution.transition_brightness(200, 1.0))
+        await asyncio.sleep(0.2)
+        # A poll replaces box.execution while the transition is running
+        await box.update()
+        await box.execution.set_state(mode="video")
+        requests = len(transport.requests)
+
+        assert await asyncio.wait_for(transition, 2.0) is False
+        # No brightness steps after the command
+        assert len(transport.requests) == requests
+        assert transport.state["execution"]["brightness"] < 200
+
+    asyncio.run(_run())
+
+
+def test_preset_cancels_transition():
+    async def _run():
+        transport = StubTransport(latency=0.01)
+        box = HueSyncBox("10.0.0.1", "box", "token", transport=transport)
+        await box.update()
+
+        transition = asyncio.create_task(box.execution.transition_brightness(200, 0.5))
+        await asyncio.sleep(0.1)
+        await Preset(brightness=20).apply(box)
+
+        assert await asyncio.wait_for(transition, 2.0) is False
+        assert transport.state["execution"]["brightness"] == 20
+
+    asyncio.run(_run())
+
+
+def test_transition_steps_do_not_cancel_transition():
+    async def _run():
+        transport = StubTransport(latency=0.01)
+        box = HueSyncBox("10.0.0.1", "box", "token", transport=transport)
+        await box.update()
+
+        assert await box.execution.transition_brightness(150, 0.2) is True
+        assert transport.state["execution"]["brightness"] == 150
+
+    asyncio.run(_run())
@@ -0,0 +1,200 @@
+import asyncio
+import json
+import os
+import time
+from typing import Dict, Optional
+
+import pytest
+
+from aiohuesyncbox import HueSyncBox
+from aiohuesyncbox.errors import AiohuesyncboxException, InvalidState, Unauthorized
+from aiohuesyncbox.fleet import BoxConfig, FleetRunner, validate_registrations
+from aiohuesyncbox.transport import Response, Send
+from benchmarks.stub import StubTransport
+
+LATENCY = 0.05
+CPU_TIME = 0.005
+
+
+class ChangingStub(StubTransport):
+    """Stub box of which the brightness changes on every poll, so every poll is an update."""
+
+    def __init__(self, latency: float = LATENCY) -> None:
+        super().__init__(latency=latency)
+
+    async def send(
+        self,
+        method: str,
+        path: str,
+        data: Optional[Dict],
+        headers: Dict[str, str],
+        send: Send,
+    ) -> Optional[Response]:
+        if method.lower() == "get" and path == "":
+            execution = self.state["execution"]
+            execution["brightness"] = (execution["brightness"] + 1) % 201
+        if path == "/unauthorized":
+            body = {"code": 2, "message": "Invalid token"}
+            return Response(401, "application/json", json.dumps(body).encode())
+        if path == "/invalidstate":
+            body = {"code": 16, "message": "Invalid state"}
+            return Response(400, "application/json", json.dumps(body).encode())
+        return await super().send(method, path, data, headers, send)
+
+
+class CpuBoundStub(ChangingStub):
+    """Stub box that keeps the worker busy for each poll, like TLS and JSON handling do."""
+
+    def __init__(self) -> None:
+        super().__init__(latency=0)
+
+    async def send(self, method, path, data, headers, send):
+        end = time.perf_counter() + CPU_TIME
+        while time.perf_counter() < end:
+            pass
+        return await super().send(method, path, data, headers, send)
+
+
+class BrokenStub(StubTransport):
+    """Stub box of which the transport can not be created, so its worker stops."""
+
+    def __init__(self) -> None:
+        raise RuntimeError("Broken transport")
+
+
+def _configs(count: int, transport=ChangingStub):
+    return [
+        BoxConfig(f"10.0.0.{index}", f"box{index}", "token", transport=transport)
+        for index in range(count)
+    ]
+
+
+def _cpus() -> int:
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+async def _updates_per_second(
+    boxes: int, workers: int, duration: float, transport=ChangingStub
+) -> float:
+    async with FleetRunner(
+        _configs(boxes, transport),
+        workers=workers,
+        poll_interval=0,
+        fields=["execution.brightness"],
+    ) as runner:
+        seen = set()
+        count = 0
+        start = None
+        async for update in runner.updates():
+            assert update.error is None
+            if start is None:
+                seen.add(update.box_id)
+                if len(seen) == boxes:
+                    # All workers are running
+                    start = time.monotonic()
+                continue
+            count += 1
+            if time.monotonic() - start >= duration:
+                break
+        return count / (time.monotonic() - start)
+
+
+def test_throughput_scales_with_boxes():
+    # Polls wait for the latency of the box, so twice the boxes give about twice the updates
+    small = asyncio.run(_updates_per_second(boxes=4, workers=2, duration=1.0))
+    large = asyncio.run(_updates_per_second(boxes=8, workers=2, duration=1.0))
+
+    assert large > 1.4 * small
+
+
+@pytest.mark.skipif(_cpus() < 2, reason="Needs at least 2 CPUs")
+def test_throughput_scales_with_workers():
+    # Polls keep a worker busy, so a second worker process on another CPU adds throughput
+    single = asyncio.run(
+        _updates_per_second(boxes=8, workers=1, duration=1.0, transport=CpuBoundStub)
+    )
+    double = asyncio.run(
+        _updates_per_second(boxes=8, workers=2, duration=1.0, transport=CpuBoundStub)
+    )
+
+    assert double > 1.3 * single
+
+
+def test_request_errors_keep_their_class():
+    async def _run():
+        async with FleetRunner(_configs(2), workers=2, poll_interval=1) as runner:
+            response = await runner.request(
+                "box1", "put", "/execution", {"brightness": 50}
+            )
+            assert response == {}
+
+            with pytest.raises(Unauthorized):
+                await runner.request("box0", "get", "/unauthorized")
+            with pytest.raises(InvalidState):
+                await runner.request("box1", "get", "/invalidstate")
+
+            with pytest.raises(ValueError):
+                await runner.request("unknown", "get", "/execution")
+            assert not runner._pending
+
+    asyncio.run(_run())
+
+
+class MalformedStub(StubTransport):
+    """Stub box that answers with a body that is not JSON."""
+
+    async def send(self, method, path, data, headers, send):
+        return Response(200, "application/json", b"{not json")
+
+
+def test_validate_registrations_reports_malformed_box_unreachable():
+    async def _run():
+        good = HueSyncBox("10.0.0.1", "good", "token", transport=StubTransport())
+        bad = HueSyncBox("10.0.0.2", "bad", "token", transport=MalformedStub())
+        report = await validate_registrations([good, bad])
+        assert report.valid == [good]
+        assert report.unreachable == [bad]
+
+    asyncio.run(_run())
+
+
+def test_stopped_worker_fails_requests_of_its_boxes():
+    async def _run():
+        configs = [
+            BoxConfig("10.0.0.0", "box0", "token", transport=ChangingStub),
+            BoxConfig("10.0.0.1", "box1", "token", transport=BrokenStub),
+        ]
+        async with FleetRunner(configs, workers=2, poll_interval=1) as runner:
+            errors = set()
+            async for update in runner.updates():
+                if update.error is not None:
+                    assert "Broken transport" in update.error
+                    errors.add(update.box_id)
+                    break
+            assert errors == {"box1"}
+
+            with pytest.raises(AiohuesyncboxException):
+                await asyncio.wait_for(runner.request("box1", "get", "/execution"), 5)
+            # The other worker keeps running
+            assert await runner.request("box0", "get", "/execution")
+
+    asyncio.run(_run())
+
+
+def test_killed_worker_fails_pending_requests():
+    async def _run():
+        async with FleetRunner(_configs(2), workers=2, poll_interval=1) as runner:
+            async for update in runner.updates():
+                break
+            request = asyncio.ensure_future(
+                runner.request("box1", "put", "/execution", {"brightness": 10})
+            )
+            runner._processes[1].kill()
+            with pytest.raises(AiohuesyncboxException):
+                await asyncio.wait_for(request, 5)
+            with pytest.raises(AiohuesyncboxException):
+                await runner.request("box1", "get", "/execution")
+
+    asyncio.run(_run())
@@ -0,0 +1,43 @@
+from types import SimpleNamespace
+
+from aiohuesyncbox.history import StateHistory
+
+
+def _box(brightness, mode="video"):
+    return SimpleNamespace(execution=SimpleNamespace(brightness=brightness, mode=mode))
+
+
+def _history():
+    history = StateHistory(fields=["execution.brightness", "execution.mode"])
+    history.record(_box(50), timestamp=0)
+    history.record(_box(150), timestamp=10)
+    history.record(_box(150, "game"), timestamp=20)
+    history.record(_box(100, "game"), timestamp=30)
+    return history
+
+
+def test_range_starting_at_a_sample():
+    history = _history()
+
+    aggregate = history.aggregate("execution.brightness", start=10, end=30)
+    assert (aggregate.min, aggregate.max, aggregate.count) == (150, 150, 2)
+    assert aggregate.mean == 150
+    assert history.durations("execution.brightness", start=10, end=30) == {150: 20.0}
+    assert history.durations("execution.mode", start=10) == {
+        "video": 10.0,
+        "game": 10.0,
+    }
+
+
+def test_range_between_samples():
+    history = _history()
+
+    # The sample before start gives the value at start
+    assert history.durations("execution.brightness", start=5, end=15) == {
+        50: 5.0,
+        150: 5.0,
+    }
+    aggregate = history.aggregate("execution.brightness", start=5, end=15)
+    assert (aggregate.min, aggregate.max, aggregate.mean) == (50, 150, 100.0)
+    assert history.samples("execution.brightness", start=5, end=20) == [(10, 150)]
+    assert history.aggregate("execution.brightness", start=40, end=40) is None
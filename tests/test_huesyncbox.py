@@ -0,0 +1,30 @@
+import asyncio
+
+from aiohuesyncbox import HueSyncBox
+from aiohuesyncbox.transport import Response
+from benchmarks.stub import StubTransport
+
+
+class InvalidBodyStub(StubTransport):
+    """Stub box that answers with a body that is not JSON."""
+
+    async def send(self, method, path, data, headers, send):
+        self.requests.append((method.lower(), path, data))
+        return Response(200, "application/json", b"{not json")
+
+
+def test_keep_alive_survives_invalid_response():
+    async def _run():
+        transport = InvalidBodyStub()
+        box = HueSyncBox(
+            "10.0.0.1", "box", "token", keep_alive=0.05, transport=transport
+        )
+        async with box:
+            await asyncio.sleep(0.2)
+            task = box._keep_alive_task
+            assert task is not None and not task.done()
+        # close() waits for the task before closing the session
+        assert task.done()
+        assert len(transport.requests) >= 2
+
+    asyncio.run(_run())
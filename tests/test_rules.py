@@ -0,0 +1,59 @@
+import asyncio
+import time
+
+from aiohuesyncbox import HueSyncBox
+from aiohuesyncbox.rules import Rule, RulesEngine
+from benchmarks.stub import StubTransport
+
+
+def test_rule_added_later_starts_from_current_state():
+    async def _run():
+        transport = StubTransport()
+        box = HueSyncBox("10.0.0.1", "box", "token", transport=transport)
+        engine = RulesEngine()
+        engine.add_rule(Rule("execution.brightness", 50, {"mode": "video"}))
+        await box.update()
+        assert await engine.process(box) == []
+
+        # Already matching when added, that is the starting point
+        rule = Rule("execution.mode", "passthrough", {"brightness": 10})
+        engine.add_rule(rule)
+        await box.update()
+        assert await engine.process(box) == []
+
+        # Matching again after a change runs the action
+        transport.state["execution"]["mode"] = "game"
+        await box.update()
+        assert await engine.process(box) == []
+        transport.state["execution"]["mode"] = "passthrough"
+        await box.update()
+        assert await engine.process(box) == [rule]
+        assert transport.state["execution"]["brightness"] == 10
+
+    asyncio.run(_run())
+
+
+def test_debounce_runs_action_without_next_update():
+    async def _run():
+        transport = StubTransport()
+        box = HueSyncBox("10.0.0.1", "box", "token", transport=transport)
+        engine = RulesEngine()
+        ran = asyncio.Event()
+
+        async def _action(box):
+            ran.set()
+
+        engine.add_rule(Rule("execution.mode", "video", _action, debounce=0.2))
+        await box.update()
+        await engine.process(box)
+
+        transport.state["execution"]["mode"] = "video"
+        await box.update()
+        start = time.monotonic()
+        assert await engine.process(box) == []
+
+        # No further updates, the action runs when the debounce ends
+        await asyncio.wait_for(ran.wait(), 1.0)
+        assert 0.15 < time.monotonic() - start < 0.5
+
+    asyncio.run(_run())
@@ -0,0 +1,23 @@
+import threading
+import time
+
+import pytest
+
+from aiohuesyncbox.sync import HueSyncBoxSync
+from benchmarks.stub import StubTransport
+
+
+def test_invalid_arguments_do_not_start_thread():
+    threads = threading.active_count()
+    with pytest.raises(ValueError):
+        HueSyncBoxSync("10.0.0.1", "box", keep_alive=0)
+    assert threading.active_count() == threads
+
+
+def test_keep_alive_starts_without_initialize():
+    transport = StubTransport()
+    with HueSyncBoxSync(
+        "10.0.0.1", "box", "token", keep_alive=0.1, transport=transport
+    ):
+        time.sleep(0.35)
+    assert ("get", "/execution", None) in transport.requests
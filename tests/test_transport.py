@@ -0,0 +1,89 @@
+import asyncio
+import json
+import time
+
+from aiohuesyncbox import HueSyncBox
+from aiohuesyncbox.transport import RecordingTransport, ReplayTransport, Response
+
+
+async def _network(method, path, data, headers):
+    if path == "/registrations":
+        body = {"registrationId": "1", "accessToken": "secret-token"}
+    else:
+        await asyncio.sleep(0.05)
+        body = {"mode": "passthrough"}
+    return Response(200, "application/json", json.dumps(body).encode())
+
+
+def test_recording_redacts_access_token(tmp_path):
+    filename = str(tmp_path / "traffic.jsonl")
+
+    async def _run():
+        with RecordingTransport(filename) as transport:
+            box = HueSyncBox("10.0.0.1", "box", transport=transport)
+            box._send = _network
+            info = await box.register("app", "instance")
+            # The application still gets the token
+            assert info["access_token"] == "secret-token"
+
+    asyncio.run(_run())
+
+    with open(filename, encoding="utf-8") as file:
+        recording = file.read()
+    assert "secret-token" not in recording
+    assert json.loads(json.loads(recording)["b"])["accessToken"] == "REDACTED"
+
+
+def test_realtime_replay_keeps_recorded_timing(tmp_path):
+    filename = str(tmp_path / "traffic.jsonl")
+
+    async def _record():
+        with RecordingTransport(filename) as transport:
+            box = HueSyncBox("10.0.0.1", "box", "token", transport=transport)
+            box._send = _network
+            await box.request("get", "/execution")
+            await asyncio.sleep(0.2)
+            await box.request("get", "/execution")
+
+    async def _replay():
+        box = HueSyncBox(
+            "10.0.0.1",
+            "box",
+            "token",
+            transport=ReplayTransport(filename, realtime=True),
+        )
+        start = time.monotonic()
+        await box.request("get", "/execution")
+        await box.request("get", "/execution")
+        return time.monotonic() - start
+
+    asyncio.run(_record())
+    # Two responses of 0.05 seconds with 0.2 seconds in between
+    assert 0.28 < asyncio.run(_replay()) < 0.5
+
+
+def test_repeat_restarts_timing_per_path(tmp_path):
+    filename = str(tmp_path / "traffic.jsonl")
+    with open(filename, "w", encoding="utf-8") as file:
+        for offset, path in ((0.0, "/execution"), (0.2, "/execution"), (0.3, "/hdmi")):
+            record = {"t": offset, "d": 0, "m": "get", "p": path}
+            record.update(s=200, c="application/json", b="{}")
+            file.write(json.dumps(record) + "\n")
+
+    async def _replay():
+        box = HueSyncBox(
+            "10.0.0.1",
+            "box",
+            "token",
+            transport=ReplayTransport(filename, realtime=True, repeat=True),
+        )
+        start = time.monotonic()
+        await box.request("get", "/execution")
+        await box.request("get", "/execution")
+        # Starts the recordings of /execution over, not those of /hdmi
+        await box.request("get", "/execution")
+        await box.request("get", "/hdmi")
+        return time.monotonic() - start
+
+    # /hdmi is returned at its recorded time, 0.3 seconds after the first request
+    assert 0.28 < asyncio.run(_replay()) < 0.42